@@ -3,12 +3,17 @@ Day 1 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/1
 """
 
+import argparse
+import itertools
+import sys
 import numpy
-import logging
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '01.input'
+CHUNK_SIZE = 2**22    # depths per vectorized step of count_window_increases
+STREAM_CHUNK_SIZE = 2**10  # depths per printed count of stream_main
+DEPTH_DTYPE = '<i4'   # element type of binary depth files
 
 
 def count_increasing(data: list) -> int:
@@ -27,7 +32,7 @@ def count_increasing(data: list) -> int:
         [199, 200, 208, 210, 200, 207, 240, 269, 260, 263], 3))
     5
     """
-    return sum(data[n] > data[n - 1] for n in range(1, len(data)))
+    return int(numpy.count_nonzero(numpy.diff(data) > 0))
 
 
 def sliding_window(data: list, window_size=1, operation=sum) -> list:
@@ -48,16 +53,194 @@ def sliding_window(data: list, window_size=1, operation=sum) -> list:
             for i in range(len(data) - window_size + 1)]
 
 
+def count_window_increases(depths: numpy.array, window_sizes=(1, 3),
+                           chunk_size: int = CHUNK_SIZE) -> dict:
+    """Counts the increasing sliding window sums for several window sizes
+
+    The sum of window i + 1 minus the sum of window i is
+    depths[i + k] - depths[i] (for window size k), so a window sum increases
+    exactly when depths[i + k] > depths[i]. This needs no sums at all (so no
+    overflow) and is O(n) for every window size. The depths are processed in
+    chunks of chunk_size (overlapping by the largest window size), so a
+    memory-mapped series is read once and never loaded as a whole.
+
+    Args:
+        depths (numpy.array): 1d array of depths (may be memory-mapped)
+        window_sizes (iterable[int], optional): window sizes. Defaults to
+                                                (1, 3).
+        chunk_size (int, optional): number of depths per step
+
+    Returns:
+        dict: {window size: number of increasing window sums}
+
+    Example:
+    >>> count_window_increases(numpy.array( \
+        [199, 200, 208, 210, 200, 207, 240, 269, 260, 263]), (1, 3, 9), 4)
+    {1: 7, 3: 5, 9: 1}
+    """
+    counts = dict.fromkeys(window_sizes, 0)
+    chunks = (depths[start:start + chunk_size]
+              for start in range(0, len(depths), chunk_size))
+    for counts in stream_window_increases(chunks, window_sizes):
+        pass
+    return counts
+
+
+def stream_window_increases(chunks, window_sizes=(1, 3)):
+    """Counts increasing sliding window sums over a stream of depth chunks
+
+    Only the last max(window_sizes) depths are carried over to the next
+    chunk, so the memory use doesn't depend on the length of the stream.
+    See count_window_increases for the counting method.
+
+    Args:
+        chunks (iterable[numpy.array]): consecutive chunks of depths (see
+                                        read_depth_chunks)
+        window_sizes (iterable[int], optional): window sizes. Defaults to
+                                                (1, 3).
+
+    Yields:
+        dict: running {window size: number of increasing window sums}
+              after each chunk
+
+    Example:
+    >>> chunks = read_depth_chunks(['199', '200', '208', '210', '200',
+    ...                             '207', '240', '269', '260', '263'], 4)
+    >>> for counts in stream_window_increases(chunks):
+    ...     print(counts)
+    {1: 3, 3: 1}
+    {1: 6, 3: 3}
+    {1: 7, 3: 5}
+    """
+    counts = dict.fromkeys(window_sizes, 0)
+    overlap = max(counts, default=0)
+    tail = None
+    for chunk in chunks:
+        tail = chunk[:0] if tail is None else tail
+        block = numpy.concatenate((tail, chunk))
+        for k in counts:
+            # Compare depths[i + k] with depths[i] for all i + k in chunk
+            start = max(len(tail) - k, 0)
+            m = len(block) - k - start
+            if m > 0:
+                counts[k] += int(numpy.count_nonzero(
+                    block[start + k:start + k + m] > block[start:start + m]))
+        tail = block[max(len(block) - overlap, 0):] if overlap else tail
+        yield dict(counts)
+
+
+def read_depth_chunks(depths, chunk_size: int = CHUNK_SIZE):
+    """Reads depths in chunks from an iterable, e.g. a file or sys.stdin
+
+    Each chunk of lines (or numbers) is converted in one vectorized step.
+
+    Args:
+        depths (iterable): lines with depths (str or bytes), or numbers
+        chunk_size (int, optional): number of depths per chunk
+
+    Raises:
+        ValueError: for lines that aren't numbers
+
+    Yields:
+        numpy.array: chunks of at most chunk_size depths
+    """
+    iterator = iter(depths)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        if isinstance(chunk[0], (str, bytes)):
+            text = ' '.join(AoC.as_text(line) for line in chunk)
+            yield AoC.parse_numbers(text)
+        else:
+            yield numpy.fromiter(chunk, dtype=int, count=len(chunk))
+
+
+def map_depths(filename: str, dtype: str = DEPTH_DTYPE) -> numpy.array:
+    """Memory-maps a binary file of depths (e.g. a sonar dump)
+
+    Args:
+        filename (str): name of the file, relative to AoC.py
+        dtype (str, optional): element type. Defaults to little endian
+                               int32.
+
+    Returns:
+        numpy.array: read-only 1d array of depths, backed by the file
+    """
+    path = AoC.input_path(filename)
+    if path.stat().st_size == 0:
+        return numpy.zeros(0, dtype=dtype)  # empty files can't be mapped
+    return numpy.memmap(path, dtype=dtype, mode='r')
+
+
+def parse_depths(data: str) -> numpy.array:
+    """Parse the depths (one per line) from the puzzle input
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        numpy.array: array of depths
+    """
+    return numpy.array(AoC.as_text(data).split(), dtype=int)
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+
+    Example:
+    >>> solve('199 200 208 210 200 207 240 269 260 263')
+    (7, 5)
+    """
+    with AoC.phase('parse'):
+        depths = parse_depths(data)
+
+    # Both parts are solved in the same pass over the depths
+    with AoC.phase('part 1 and 2'):
+        counts = count_window_increases(depths, (1, 3))
+
+    return counts[1], counts[3]
+
+
 def main():
-    depths = numpy.loadtxt(INPUTFILE, dtype='int')
+    increasing1, increasing2 = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
-    print(f'{count_increasing(depths)=}')
+    print(f'Number of increasing depths: {increasing1}')
 
     print('\n*** Second part of the assignment ***')
-    smooth_depths = sliding_window(depths, 3)
-    print(f'{count_increasing(smooth_depths)=}')
+    print(f'Number of increasing sums of 3 depths: {increasing2}')
+
+
+def stream_main(file=None, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Prints the running counts for depths read from file (default: stdin)
+
+    A line is printed after every chunk of chunk_size depths; use a small
+    chunk_size for a live feed.
+    """
+    chunks = read_depth_chunks(sys.stdin if file is None else file,
+                               chunk_size)
+    for counts in stream_window_increases(chunks, (1, 3)):
+        print(f'Increasing depths: {counts[1]}; '
+              f'increasing sums of 3 depths: {counts[3]}', flush=True)
 
 
 if __name__ == "__main__":
-    main()
+    AoC.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--stream', action='store_true',
+                        help='read depths from stdin and print running '
+                             'counts, e.g. python 01.py --stream < 01.input')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                        help='depths per printed count with --stream '
+                             f'(default: {STREAM_CHUNK_SIZE})')
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be positive')
+    if args.stream:
+        stream_main(chunk_size=args.chunk_size)
+    else:
+        main()
@@ -4,12 +4,13 @@ See: https://adventofcode.com/2021/day/2
 """
 
 
-import logging
+import re
 import numpy
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '02.input'
+COMMANDS = ('forward', 'down', 'up')  # command codes are indices in this
 INITIAL_POSITION = [0, 0, 0]  # horizontal, vertical, aim
 DIRECTIONS_1 = {
     'forward': (1, 0, 0),
@@ -21,32 +22,180 @@ DIRECTIONS_2 = {
     'down': (0, 0, 1),
     'up': (0, 0, -1)
 }
+AIM_COUPLING_2 = {'forward': 1}  # vertical += coupling * magnitude * aim
 
 
-def main():
-    with open(IMPORT_FILE, 'rt') as filehandler:
-        route = [tuple([cast(item)
-                        for cast, item in zip([str, int], line.split(' '))])
-                 for line in filehandler]
+def parse_route(data: str) -> tuple:
+    """Parse the route (one command and magnitude per line)
 
-    position = numpy.array(INITIAL_POSITION)
-    for step in route:
-        position += numpy.array(DIRECTIONS_1[step[0]]) * step[1]
-        logging.debug(f'Position after {step=} is: {position=}')
+    Args:
+        data (str): puzzle input (str or bytes)
 
-    print('*** First part of the assignment ***')
-    print(f'Product of position coordinates: {numpy.prod(position[0:2])}')
+    Raises:
+        ValueError: if the route doesn't alternate commands and magnitudes
+
+    Returns:
+        tuple: (numpy.array with command codes (indices in COMMANDS),
+                numpy.array with magnitudes)
+
+    Example:
+    >>> parse_route('forward 5 up 3')
+    (array([0, 2], dtype=int8), array([5, 3]))
+    >>> parse_route('1 5')
+    Traceback (most recent call last):
+    ...
+    ValueError: Route must alternate commands and magnitudes
+    """
+    # Check that commands and magnitudes alternate, then replace the commands
+    # by their codes and parse all numbers at once
+    text = AoC.as_text(data)
+    commands = '|'.join(COMMANDS)
+    if not re.fullmatch(rf'(?:\s*(?:{commands})\s+-?\d+(?=\s|$))*\s*', text):
+        raise ValueError('Route must alternate commands and magnitudes')
+    for code, command in enumerate(COMMANDS):
+        text = text.replace(command, str(code))
+    numbers = AoC.parse_numbers(text)
+    codes = numbers[0::2]
+    if len(numbers) % 2 or ((codes < 0) | (codes >= len(COMMANDS))).any():
+        raise ValueError('Route must alternate commands and magnitudes')
+
+    return codes.astype(numpy.int8), numbers[1::2]
+
+
+def rule_table(directions: dict, aim_coupling: dict = None) -> tuple:
+    """Converts a movement rule into arrays for evaluate_rules
+
+    Args:
+        directions (dict): (horizontal, vertical, aim) direction per command
+        aim_coupling (dict, optional): per command, the factor of
+                                       magnitude * aim that is added to the
+                                       vertical position. Defaults to none.
+
+    Returns:
+        tuple: (numpy.array with a direction per command code,
+                numpy.array with the aim coupling per command code)
+    """
+    aim_coupling = aim_coupling or {}
+    return (numpy.array([directions[command] for command in COMMANDS]),
+            numpy.array([aim_coupling.get(command, 0)
+                         for command in COMMANDS]))
+
+
+def route_moments(codes: numpy.array, magnitudes: numpy.array) -> tuple:
+    """Summarizes a route for evaluating any number of rule tables
+
+    The final position under a rule table only depends on the total
+    magnitude per command and on K, where K[c', c] is the sum over the
+    steps of command c' of magnitude times the running (inclusive) total of
+    the magnitudes of command c.
+
+    Args:
+        codes (numpy.array): command codes (indices in COMMANDS)
+        magnitudes (numpy.array): magnitudes of the steps
+
+    Returns:
+        tuple: (numpy.array with the total per command,
+                numpy.array K with shape (commands, commands))
+    """
+    per_command = [magnitudes * (codes == code)
+                   for code in range(len(COMMANDS))]
+    totals = numpy.array([steps.sum() for steps in per_command])
+    running = [numpy.cumsum(steps) for steps in per_command]
+    moments = numpy.array([[steps @ total for total in running]
+                           for steps in per_command])
+    return totals, moments
+
+
+def evaluate_rules(route: tuple, directions: numpy.array,
+                   aim_coupling: numpy.array) -> numpy.array:
+    """Returns the final positions of a route for a batch of rule tables
+
+    Every step moves magnitude times the direction of its command; the aim
+    after the step, times magnitude times the aim coupling of the command,
+    is added to the vertical position. The route is summarized once (see
+    route_moments), after which each table costs O(commands^2).
+
+    Args:
+        route (tuple): (command codes, magnitudes), see parse_route
+        directions (numpy.array): directions with shape (tables, commands,
+                                  3) (or (commands, 3) for one table)
+        aim_coupling (numpy.array): aim coupling with shape (tables,
+                                    commands) (or (commands,))
 
-    position = numpy.array(INITIAL_POSITION)
-    for step in route:
-        position += numpy.array(DIRECTIONS_2[step[0]]) * step[1]
-        if step[0] == 'forward':
-            position[1] += position[2] * step[1]
-        logging.debug(f'Position after {step=} is: {position=}')
+    Returns:
+        numpy.array: [horizontal, vertical, aim] per table
+
+    Example:
+    >>> route = parse_route('forward 5 down 5 forward 8 up 3')
+    >>> evaluate_rules(route, *rule_table(DIRECTIONS_2, AIM_COUPLING_2))
+    array([13, 40,  2])
+    """
+    totals, moments = route_moments(*route)
+    positions = INITIAL_POSITION + totals @ directions
+    aim_start = INITIAL_POSITION[2] * totals
+    positions[..., 1] += (aim_coupling @ aim_start +
+                          numpy.einsum('...c,cd,...d->...', aim_coupling,
+                                       moments, directions[..., 2]))
+    return positions
+
+
+def follow_route(codes: numpy.array, magnitudes: numpy.array) -> tuple:
+    """Returns the final positions of the route with both direction tables
+
+    Args:
+        codes (numpy.array): command codes (indices in COMMANDS)
+        magnitudes (numpy.array): magnitudes of the steps
+
+    Returns:
+        tuple: (final position with DIRECTIONS_1, final position with
+                DIRECTIONS_2 and AIM_COUPLING_2), as [horizontal, vertical,
+                aim] lists
+
+    Example:
+    >>> follow_route(*parse_route('forward 5 down 5 forward 8 up 3'))
+    ([13, 2, 0], [13, 40, 2])
+    """
+    directions, aim_coupling = zip(rule_table(DIRECTIONS_1),
+                                   rule_table(DIRECTIONS_2, AIM_COUPLING_2))
+    positions = evaluate_rules((codes, magnitudes), numpy.array(directions),
+                               numpy.array(aim_coupling))
+    return tuple(position.tolist() for position in positions)
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+
+    Example:
+    >>> solve('forward 5\\ndown 5\\nforward 8\\nup 3\\ndown 8\\nforward 2')
+    (150, 900)
+    """
+    with AoC.phase('parse'):
+        route = parse_route(data)
+
+    # Both parts are solved in the same pass over the route
+    with AoC.phase('part 1 and 2'):
+        position1, position2 = follow_route(*route)
+    AoC.trace(lambda: f'Final positions: {position1=}, {position2=}')
+
+    return position1[0] * position1[1], position2[0] * position2[1]
+
+
+def main():
+    product1, product2 = solve(AoC.read_input(IMPORT_FILE))
+
+    print('*** First part of the assignment ***')
+    print(f'Product of position coordinates: {product1}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Product of position coordinates: {numpy.prod(position[0:2])}')
+    print(f'Product of position coordinates: {product2}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
@@ -4,12 +4,12 @@ See: https://adventofcode.com/2021/day/3
 """
 
 
-import logging
+import AoC
 import numpy
-logging.basicConfig(level=logging.INFO)
 
 
 IMPORT_FILE = '03.input'
+MAX_WIDTH = 64  # bits per packed value
 
 
 def bitlist_to_int(bitlist: list) -> int:
@@ -20,94 +20,222 @@ def bitlist_to_int(bitlist: list) -> int:
 
     Returns:
         int: integer value of the bitlist
+
+    Example:
+    >>> bitlist_to_int([1, 0, 1, 1, 0])
+    22
     """
-    return sum(i * 2 ** n for n, i in enumerate(bitlist[::-1]))
+    value = 0
+    for bit in bitlist:
+        value = value << 1 | bool(bit)
+    return value
 
 
-def _bit_criteria(report: list, select_func: callable = numpy.argmax) -> int:
-    """Applies the bit criteria on report with selection criterium select_func
+def column_counts(values: numpy.array, width: int) -> numpy.array:
+    """Counts the 1 bits per column of a bit-packed report
 
     Args:
-        report (list): list of reported values
-        select_func (callable, optional): Defaults to numpy.argmax.
+        values (numpy.array): reported values, packed in unsigned integers
+        width (int): number of bits (columns) per value
 
     Returns:
-        int: integer value of the filtered bitlist
+        numpy.array: number of 1 bits per column, most significant first
     """
-    filtered = numpy.copy(report)
+    return numpy.array([numpy.count_nonzero(values & (1 << bit))
+                        for bit in reversed(range(width))], dtype=numpy.int64)
+
+
+def power_rates(values: numpy.array, width: int) -> tuple:
+    """Calculates the gamma and epsilon rate of a bit-packed report
+
+    A gamma rate bit is 1 if 1 is the most common bit in its column; an
+    epsilon rate bit is 1 if 1 is the least common bit in its column (but
+    does occur). Ties give 0 for both.
+
+    Args:
+        values (numpy.array): reported values, packed in unsigned integers
+        width (int): number of bits (columns) per value
+
+    Returns:
+        tuple: (gamma rate, epsilon rate)
+
+    Example:
+    >>> power_rates(*parse_report('\\n'.join([
+    ...     '00100', '11110', '10110', '10111', '10101', '01111',
+    ...     '00111', '11100', '10000', '11001', '00010', '01010'])))
+    (22, 9)
+    """
+    ones = column_counts(values, width)
+    zeros = len(values) - ones
+    gamma_rate = bitlist_to_int(ones > zeros)
+    epsilon_rate = bitlist_to_int((ones > 0) & (ones < zeros))
+    return gamma_rate, epsilon_rate
+
+
+def most_common_bit(zeros: int, ones: int) -> int:
+    """Bit criterion of the oxygen generator rating (1 for a tie)"""
+    return int(ones >= zeros)
+
+
+def least_common_bit(zeros: int, ones: int) -> int:
+    """Bit criterion of the CO2 scrubber rating (0 for a tie)"""
+    return int(ones < zeros)
+
+
+class ReportIndex:
+    """Sorted index of a bit-packed report for bit criteria queries
+
+    The values are sorted once. All values that share their first bits
+    then form a contiguous range [lo, hi), and within that range the values
+    with a 0 as next bit come before those with a 1. So each step of a bit
+    criterion narrows the range with one binary search, and a rating costs
+    O(width * log n) instead of filtering (and copying) the report once per
+    bit.
+
+    Args:
+        values (numpy.array): reported values, packed in unsigned integers
+        width (int): number of bits (columns) per value
+
+    Example:
+    >>> index = ReportIndex(*parse_report('\\n'.join([
+    ...     '00100', '11110', '10110', '10111', '10101', '01111',
+    ...     '00111', '11100', '10000', '11001', '00010', '01010'])))
+    >>> index.rating(most_common_bit), index.rating(least_common_bit)
+    (23, 10)
+    """
+
+    def __init__(self, values: numpy.array, width: int) -> None:
+        self.values = numpy.sort(values)
+        self.width = width
 
-    # Append a column of 1s for argmax for a tie in 1s and 0s
-    # if select_func == numpy.argmax:
-    #    filtered = numpy.c_[filtered, [1] * len(filtered)]
+    def rating(self, criterion: callable) -> int:
+        """Applies a bit criterion until one value is left
 
-    column = 0
-    while len(filtered) > 1:
-        counts = numpy.bincount(filtered[:, column])
-        if counts[0] == counts[1]:
-            selected = select_func([0, 1])
-        else:
-            selected = select_func(counts)
+        Args:
+            criterion (callable): function of the number of 0 and 1 bits
+                                  that returns the bit to keep. If no value
+                                  has that bit, the other values are kept.
 
-        filtered = filtered[filtered[:, column] == selected, :]
-        column += 1
+        Returns:
+            int: the value that is left after filtering
+        """
+        lo, hi = 0, len(self.values)
+        prefix = 0
+        for bit in reversed(range(self.width)):
+            if hi - lo <= 1:
+                break
 
-        logging.debug(f'{len(filtered)} items left after filtering.')
+            # First value in [lo, hi) with this bit set
+            key = self.values.dtype.type(prefix | 1 << bit)
+            split = lo + int(self.values[lo:hi].searchsorted(key))
+            zeros, ones = split - lo, hi - split
+            if (criterion(zeros, ones) and ones) or not zeros:
+                lo, prefix = split, prefix | 1 << bit
+            else:
+                hi = split
 
-    logging.debug(f'Bit criteria with {select_func.__name__}: {filtered[0]}')
-    return bitlist_to_int(filtered[0])
+            AoC.trace(lambda: f'{hi - lo} items left after filtering.')
 
+        AoC.trace(lambda: f'Bit criteria with {criterion.__name__}: '
+                          f'{int(self.values[lo]):0{self.width}b}')
+        return int(self.values[lo])
 
-def calculate_oxygen_generator_rating(report: list) -> int:
+
+def calculate_oxygen_generator_rating(index: ReportIndex) -> int:
     """Calculate the oxygen generator rating
 
     Args:
-        report (list): list of reported values
+        index (ReportIndex): sorted index of the report
 
     Returns:
         int: Oxygen generator rating
     """
-    oxy = _bit_criteria(report, numpy.argmax)
-    logging.debug(f'Oxygen generator rating = {oxy}')
+    oxy = index.rating(most_common_bit)
+    AoC.trace(lambda: f'Oxygen generator rating = {oxy}')
     return oxy
 
 
-def calculate_co2_scrubber_rating(report: list) -> int:
+def calculate_co2_scrubber_rating(index: ReportIndex) -> int:
     """Calculate the co2 scrubber rating
 
     Args:
-        report (list): list of reported values
+        index (ReportIndex): sorted index of the report
 
     Returns:
         int: co2 scrubber rating
     """
-    co2scrub = _bit_criteria(report, numpy.argmin)
-    logging.debug(f'CO2 scrubber rating = {co2scrub}')
+    co2scrub = index.rating(least_common_bit)
+    AoC.trace(lambda: f'CO2 scrubber rating = {co2scrub}')
     return co2scrub
 
 
-def main():
-    with open(IMPORT_FILE, 'rt') as filehandler:
-        report = numpy.array([list(map(int, line.strip()))
-                              for line in filehandler])
+def parse_report(data: str) -> tuple:
+    """Parse the diagnostic report (one binary number per line)
 
-    logging.debug(f'{report=}')
+    Every number is packed into one unsigned integer of the smallest type
+    that fits the number of bits (up to 64).
 
-    # Transpose, do a bincount an get the argmax/argmin for each row
-    report_t = numpy.copy(report).transpose()
-    gamma_rate = bitlist_to_int(
-        [numpy.bincount(column).argmax() for column in report_t])
-    epsilon_rate = bitlist_to_int(
-        [numpy.bincount(column).argmin() for column in report_t])
+    Args:
+        data (str): puzzle input (str or bytes)
 
-    print('*** First part of the assignment ***')
-    print(f'Power consumtion = {gamma_rate * epsilon_rate}')
+    Raises:
+        ValueError: for numbers of more than 64 bits or non-binary digits
+
+    Returns:
+        tuple: (numpy.array with the values, number of bits per value)
+    """
+    bits = AoC.digit_grid(data)
+    rows, width = bits.shape
+    if width > MAX_WIDTH:
+        raise ValueError(f'Numbers of {width} bits don\'t fit in '
+                         f'{MAX_WIDTH} bits')
+    if (bits > 1).any():
+        raise ValueError('Report contains non-binary digits')
+
+    # Pack each row into big endian bytes, then read them as one 64 bit word
+    words = numpy.zeros((rows, MAX_WIDTH // 8), dtype=numpy.uint8)
+    packed = numpy.packbits(bits, axis=1)
+    words[:, :packed.shape[1]] = packed
+    values = words.view('>u8').ravel() >> numpy.uint64(MAX_WIDTH - width) \
+        if width else numpy.zeros(rows, dtype=numpy.uint64)
+    return values.astype(numpy.min_scalar_type((1 << width) - 1)), width
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        values, width = parse_report(data)
+
+    AoC.trace(lambda: f'{width=}, {values=}')
+
+    with AoC.phase('part 1'):
+        gamma_rate, epsilon_rate = power_rates(values, width)
+
+    with AoC.phase('part 2'):
+        index = ReportIndex(values, width)
+        oxy = calculate_oxygen_generator_rating(index)
+        co2 = calculate_co2_scrubber_rating(index)
 
-    oxy = calculate_oxygen_generator_rating(report)
-    co2 = calculate_co2_scrubber_rating(report)
+    return gamma_rate * epsilon_rate, oxy * co2
+
+
+def main():
+    power_consumption, life_support = solve(AoC.read_input(IMPORT_FILE))
+
+    print('*** First part of the assignment ***')
+    print(f'Power consumtion = {power_consumption}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Life support rating = {oxy * co2}')
+    print(f'Life support rating = {life_support}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
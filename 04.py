@@ -4,18 +4,29 @@ See: https://adventofcode.com/2021/day/4
 """
 
 
+import io
+import itertools
+import sys
 import numpy
-import logging
-logging.basicConfig(level=logging.DEBUG)
+import AoC
 
 
 IMPORT_FILE = '04.input'
 BOARD_SIZE = 5
+BOARD_CHUNK = 2**14  # boards per vectorized step of read_boards
 
 
-def read_data():
+def parse_data(data: str) -> tuple:
+    """Parse draws and bingo boards from the puzzle input
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (numpy.array with draws, 3d numpy.array with boards)
+    """
     boards = []
-    with open(IMPORT_FILE, 'rt') as filehandler:
+    with io.StringIO(AoC.as_text(data)) as filehandler:
         draws = numpy.array(filehandler.readline().strip().split(','),
                             dtype=int)
 
@@ -27,52 +38,257 @@ def read_data():
     return draws, numpy.array(boards)
 
 
+def draw_turns(draws: numpy.array, boards: numpy.array) -> numpy.array:
+    """Replaces every number on the boards by the turn it is drawn
+
+    Args:
+        draws (numpy.array): drawn numbers, in order
+        boards (numpy.array): 3d array with boards
+
+    Returns:
+        numpy.array: turns with the shape of boards; numbers that are never
+                     drawn get turn len(draws)
+
+    Example:
+    >>> draw_turns(numpy.array([7, 4, 9, 4]), numpy.array([[[4, 5], [9, 7]]]))
+    array([[[1, 4],
+            [2, 0]]], dtype=uint8)
+    """
+    never = len(draws)
+    turn_of = numpy.full(max(draws.max(initial=0), boards.max(initial=0)) + 1,
+                         never, dtype=numpy.min_scalar_type(never))
+    # Assign in reverse, so the first draw of a number is kept
+    turn_of[draws[::-1]] = numpy.arange(never)[::-1]
+    return turn_of[boards]
+
+
+def rank_boards(draws: numpy.array, boards: numpy.array) -> tuple:
+    """Determines the win turn, win order and score of all boards at once
+
+    A row or column is complete at the latest turn of its numbers, and a
+    board wins at the earliest turn a row or column is complete. The score
+    is the sum of the numbers that are not drawn by then, times the number
+    drawn at the win turn.
+
+    Args:
+        draws (numpy.array): drawn numbers, in order
+        boards (numpy.array): 3d array with boards
+
+    Returns:
+        tuple: (numpy.array with board indices in order of winning (ties in
+                board order), numpy.array with the win turn per board
+                (len(draws) if it never wins), numpy.array with the score
+                per board (0 if it never wins))
+    """
+    turns = draw_turns(draws, boards)
+    win_turns = numpy.minimum(turns.max(axis=2).min(axis=1),
+                              turns.max(axis=1).min(axis=1))
+    order = numpy.argsort(win_turns, kind='stable')
+
+    winning = win_turns < len(draws)
+    unmarked = numpy.where(turns > win_turns[:, None, None], boards, 0)
+    scores = numpy.zeros(len(boards), dtype=numpy.int64)
+    scores[winning] = (unmarked[winning].sum(axis=(1, 2)) *
+                       draws[win_turns[winning]])
+    return order, win_turns, scores
+
+
+def read_boards(lines, chunk_size: int = BOARD_CHUNK):
+    """Reads bingo boards in chunks from lines, e.g. a file or sys.stdin
+
+    Empty lines are skipped; each chunk of rows is parsed in one vectorized
+    step.
+
+    Args:
+        lines (iterable[str]): lines with board rows
+        chunk_size (int, optional): number of boards per chunk
+
+    Raises:
+        ValueError: for rows that aren't BOARD_SIZE numbers or incomplete
+                    boards
+
+    Yields:
+        numpy.array: 3d array with at most chunk_size boards
+    """
+    rows = (line for line in lines if line.strip())
+    while chunk := list(itertools.islice(rows, chunk_size * BOARD_SIZE)):
+        if (len(chunk) % BOARD_SIZE
+                or any(len(row.split()) != BOARD_SIZE for row in chunk)):
+            raise ValueError(f'Boards must have {BOARD_SIZE}x{BOARD_SIZE} '
+                             'numbers')
+        numbers = AoC.parse_numbers(' '.join(chunk))
+        yield numbers.reshape(-1, BOARD_SIZE, BOARD_SIZE)
+
+
+class BingoGame:
+    """Bingo on many boards, with winners reported as the draws arrive
+
+    The boards are not kept; they are stored as an inverted index in CSR
+    form: the cells of all boards grouped by their number, with the offset
+    of each number's group. It is built chunk by chunk, so the boards never
+    exist as one array. Each draw only updates the hit counters of the rows
+    and columns of the cells of the drawn number, and the sum of the
+    unmarked numbers of their boards.
+
+    Args:
+        board_chunks (iterable[numpy.array]): 3d arrays with boards (see
+                                              read_boards)
+
+    Example:
+    >>> game = BingoGame([numpy.array([[[1, 2], [3, 4]]]),
+    ...                   numpy.array([[[4, 3], [5, 6]]])])
+    >>> for draw in 4, 2, 3:
+    ...     print(draw, *game.draw(draw))
+    4 [] []
+    2 [0] [8]
+    3 [1] [33]
+    """
+
+    def __init__(self, board_chunks) -> None:
+        self.size = BOARD_SIZE
+        count = 0
+        counts = numpy.zeros(0, dtype=numpy.int64)  # cells per number
+        groups, unmarked = [], []
+        for chunk in board_chunks:
+            chunk = numpy.asarray(chunk)
+            self.size = chunk.shape[1]
+            first_cell, count = count * self.size**2, count + len(chunk)
+
+            # The cells of the chunk sorted by number, with compact types
+            numbers = chunk.reshape(-1)
+            order = numpy.argsort(numbers, kind='stable')
+            cell_type = numpy.int32 if count * self.size**2 < 2**31 else \
+                numpy.int64
+            numbers = numbers[order].astype(
+                numpy.min_scalar_type(numbers.max(initial=0)))
+            groups.append((numbers, (order + first_cell).astype(cell_type)))
+            unmarked.append(chunk.sum(axis=(1, 2)))
+
+            chunk_counts = numpy.bincount(numbers)
+            counts = numpy.pad(counts, (0, max(len(chunk_counts) -
+                                               len(counts), 0)))
+            counts[:len(chunk_counts)] += chunk_counts
+
+        # Place the cells of every chunk after those of earlier chunks
+        cell_type = groups[-1][1].dtype if groups else numpy.int32
+        self._offsets = numpy.zeros(len(counts) + 1, dtype=cell_type)
+        numpy.cumsum(counts, out=self._offsets[1:])
+        self._cells = numpy.empty(self._offsets[-1], dtype=cell_type)
+        filled = self._offsets[:-1].copy()
+        while groups:
+            numbers, cells = groups.pop(0)
+            values, starts, lengths = numpy.unique(
+                numbers, return_index=True, return_counts=True)
+            rank = numpy.arange(len(numbers)) - numpy.repeat(starts, lengths)
+            self._cells[filled[numbers] + rank] = cells
+            filled[values] += lengths.astype(cell_type)
+
+        hit_type = numpy.min_scalar_type(self.size)
+        self.unmarked = numpy.concatenate(unmarked + [[]]).astype(numpy.int64)
+        self.row_hits = numpy.zeros((count, self.size), dtype=hit_type)
+        self.col_hits = numpy.zeros((count, self.size), dtype=hit_type)
+        self.won = numpy.zeros(count, dtype=bool)
+        self.drawn = set()
+
+    def draw(self, number: int) -> tuple:
+        """Marks a drawn number on all boards
+
+        Args:
+            number (int): drawn number
+
+        Returns:
+            tuple: (numpy.array with the boards that win with this draw,
+                    numpy.array with their scores)
+        """
+        if number in self.drawn or not 0 <= number < len(self._offsets) - 1:
+            return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
+        self.drawn.add(number)
+
+        cells = self._cells[self._offsets[number]:self._offsets[number + 1]]
+        board, cell = numpy.divmod(cells, self.size**2)
+        row, col = numpy.divmod(cell, self.size)
+        if (numpy.diff(board) != 0).all():
+            # The cells are sorted by board, so each board occurs only once
+            self.row_hits[board, row] += 1
+            self.col_hits[board, col] += 1
+            self.unmarked[board] -= number
+        else:  # a board has this number more than once
+            numpy.add.at(self.row_hits, (board, row), 1)
+            numpy.add.at(self.col_hits, (board, col), 1)
+            numpy.subtract.at(self.unmarked, board, number)
+
+        complete = ((self.row_hits[board, row] == self.size) |
+                    (self.col_hits[board, col] == self.size))
+        winners = numpy.unique(board[complete & ~self.won[board]])
+        self.won[winners] = True
+        return winners, self.unmarked[winners] * number
+
+    def play(self, draws):
+        """Draws numbers and yields the winners of each draw
+
+        Args:
+            draws (iterable[int]): drawn numbers, e.g. from a live feed
+
+        Yields:
+            tuple: (drawn number, winning boards, their scores)
+        """
+        for number in draws:
+            yield (number, *self.draw(number))
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        draws, boards = AoC.cached_parse(data, parse_data)
+    AoC.trace(lambda: f'{draws=}')
+    AoC.trace(lambda: f'{boards=}')
+
+    # Both parts follow from the win order of all boards
+    with AoC.phase('part 1 and 2'):
+        order, win_turns, scores = rank_boards(draws, boards)
+        winners = order[win_turns[order] < len(draws)]
+        first, last = winners[0], winners[-1]
+
+        AoC.trace(lambda: f'First winning board is board {first} in turn '
+                          f'{win_turns[first]}:\n{boards[first]}')
+        AoC.trace(lambda: f'Last winning board is board {last} in turn '
+                          f'{win_turns[last]}:\n{boards[last]}')
+
+    return int(scores[first]), int(scores[last])
+
+
 def main():
-    draws, boards = read_data()
-    logging.debug(f'{draws=}')
-    logging.debug(f'{boards=}')
-
-    winning_boards = []
-    boardsum = 0
-    for round, draw in enumerate(draws):
-        # Set all drawn numbers to -1
-        boards[boards == draw] = -1
-
-        logging.debug(f'Round: {round}. {draw=}. '
-                      f'Matched numers: {(boards == -1).sum()}')
-
-        # If a column / row is full, its sum is -BOARD_SIZE
-        for ax in [1, 2]:
-            if -BOARD_SIZE in boards.sum((ax,)):
-                for board in numpy.where(boards.sum((ax,)) == -BOARD_SIZE)[0]:
-                    if board not in winning_boards:
-                        winning_boards.append(board)
-
-        # Save the data for the first winning board
-        if winning_boards and boardsum == 0:
-            win_board = winning_boards[0]
-            boardsum1 = boards[win_board][boards[win_board] > 0].sum()
-            winning_draw = draw
-
-            logging.debug(f'Winning board is board {win_board}:\n'
-                          f'{boards[win_board]}.\n'
-                          f'Sum is: {boardsum1}.\n'
-                          f'Last draw was: {draw}.')
-
-        # Stop when all boards have won
-        if len(winning_boards) == len(boards):
-            break
+    with AoC.parse_cache():
+        score1, score2 = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
-    print(f'Final score = {boardsum1 * winning_draw}')
-
-    last_board = winning_boards[-1]
-    boardsum2 = boards[last_board][boards[last_board] > 0].sum()
-    last_draw = draw
+    print(f'Final score = {score1}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Final score = {boardsum2 * last_draw}')
+    print(f'Final score = {score2}')
+
+
+def stream_main(file=sys.stdin, chunk_size: int = BOARD_CHUNK):
+    """Prints the winners as they win, for a game read from file"""
+    lines = iter(file)
+    draws = AoC.parse_numbers(next(lines, ''), sep=',')
+    game = BingoGame(read_boards(lines, chunk_size))
+    for number, winners, scores in game.play(draws):
+        for board, score in zip(winners, scores):
+            print(f'Draw {number}: board {board} wins with score {score}',
+                  flush=True)
 
 
 if __name__ == "__main__":
-    main()
+    AoC.setup_logging()
+    if sys.argv[1:] == ['--stream']:  # e.g. python 04.py --stream < 04.input
+        stream_main()
+    else:
+        main()
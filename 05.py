@@ -3,104 +3,720 @@ Day 5 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/5
 """
 
+from multiprocessing import shared_memory
+import concurrent.futures
+import itertools
+import os
+import re
 import numpy
-import collections
-import logging
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '05.input'
+CHUNK_POINTS = 2**24  # points per vectorized step of count_overlaps
+DENSE_FACTOR = 4     # see count_overlaps
+TILE_SIZE = 2**11    # points per axis of the tiles of lines_to_graph
+SWEEP_LENGTH = 768   # mean points per line from which to sweep, not raster
 
 
-def str_to_coord(string: str) -> list:
-    return list(map(int, string.strip().split(',')))
+def parse_data(data: str) -> numpy.array:
+    """Parse line segments from the puzzle input
 
+    Args:
+        data (str): puzzle input (str or bytes)
 
-def read_data():
-    lines = []
-    with open(IMPORT_FILE, 'rt') as filehandler:
-        for line in filehandler:
-            from_to = line.strip().split('->')
-            lines.append([str_to_coord(string) for string in from_to])
+    Raises:
+        ValueError: for lines that aren't x1,y1 -> x2,y2
 
-    logging.debug(f'{len(lines)} read from {IMPORT_FILE}')
-    return numpy.array(lines)
+    Returns:
+        numpy.array: array of shape (lines, 2, 2) with from and to (x, y)
 
+    Example:
+    >>> parse_data('1,2,3 -> 4')
+    Traceback (most recent call last):
+    ...
+    ValueError: Lines must be given as x1,y1 -> x2,y2
+    """
+    # Check every line, then parse all numbers at once
+    text = AoC.as_text(data)
+    if not re.fullmatch(r'(?:[ \t]*(?:\d+,\d+[ \t]*->[ \t]*\d+,\d+)?'
+                        r'[ \t\r]*(?:\n|$))*', text):
+        raise ValueError('Lines must be given as x1,y1 -> x2,y2')
+    numbers = AoC.parse_numbers(text.replace('->', ' ').replace(',', ' '))
+    lines = numbers.reshape(-1, 2, 2)
 
-def _is_straight(from_xy: numpy.array, to_xy: numpy.array) -> bool:
-    return any(from_xy[ax] == to_xy[ax] for ax in range(len(from_xy)))
+    AoC.trace(lambda: f'{len(lines)} lines parsed')
+    return lines
 
 
-def lines_to_graph(lines: numpy.array,
-                   only_straight: bool = True) -> numpy.array:
-    # Create a map based on the max x, y values
-    graph = numpy.zeros(lines.max((0,)).max((0,)) + 1, dtype=int)
-    logging.debug(f'Created map of size {graph.shape}')
+def segment_indices(lines: numpy.array, height: int) -> numpy.array:
+    """Returns the linear indices x * height + y of all points of lines
 
-    for from_xy, to_xy in lines:
-        if _is_straight(from_xy, to_xy):
-            minx, maxx = sorted([from_xy[0], to_xy[0]])
-            miny, maxy = sorted([from_xy[1], to_xy[1]])
-            graph[minx:maxx + 1, miny:maxy + 1] += 1
+    Works for horizontal, vertical and 45 degree lines. Along a line, the
+    linear index changes by the same step at every point, so the indices of
+    all lines are generated at once: every line repeats its start index and
+    step for its number of points.
 
-        elif not only_straight:
-            dx = 1 if from_xy[0] < to_xy[0] else -1
-            dy = 1 if from_xy[1] < to_xy[1] else -1
-            for x, y in zip(range(from_xy[0], to_xy[0] + dx, dx),
-                            range(from_xy[1], to_xy[1] + dy, dy)):
-                graph[x, y] += 1
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y), with 0 <= y < height
+        height (int): size of the map along the y axis
 
-        logging.debug(f'{from_xy} -> {to_xy} '
-                      f'straight line: {_is_straight(from_xy, to_xy)}; '
-                      f'after drawing, {len(graph[graph > 0])} points on map; '
-                      f'max lines crossings: {graph.max()} '
-                      f'crossings count: {len(graph[graph > 1])}')
+    Returns:
+        numpy.array: linear indices of all points, line after line
 
-    return graph
+    Example:
+    >>> segment_indices(numpy.array([[[1, 1], [1, 3]], [[9, 7], [7, 9]]]), 10)
+    array([11, 12, 13, 97, 88, 79])
+    """
+    start, delta = lines[:, 0], lines[:, 1] - lines[:, 0]
+    length = numpy.abs(delta).max(axis=1) + 1
+    step = numpy.sign(delta) @ [height, 1]
+    first = numpy.cumsum(length) - length  # position of the first point
 
+    return (numpy.repeat(start @ [height, 1] - first * step, length) +
+            numpy.arange(length.sum()) * numpy.repeat(step, length))
 
-def lines_to_pointdict(lines: numpy.array,
-                       only_straight: bool = True) -> dict:
-    points = collections.defaultdict(int)
 
-    for from_xy, to_xy in lines:
-        assert ((from_xy[0] == to_xy[0]) or  # vertical line
-                (from_xy[1] == to_xy[1]) or  # horizontal line
-                (abs(to_xy[0] - from_xy[0]) == abs(to_xy[1] - from_xy[1])))
-                # diagnonal line
+def clip_lines(lines: numpy.array, low: tuple, high: tuple) -> numpy.array:
+    """Returns the parts of lines that lie within a box
 
-        dx = 1 if from_xy[0] <= to_xy[0] else -1
-        dy = 1 if from_xy[1] <= to_xy[1] else -1
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y) of horizontal, vertical or 45 degree
+                             lines
+        low (tuple): (x, y) of the lowest corner of the box (inclusive)
+        high (tuple): (x, y) of the highest corner of the box (exclusive)
 
-        if _is_straight(from_xy, to_xy) or not only_straight:
-            x_range = list(range(from_xy[0], to_xy[0] + dx, dx))
-            y_range = list(range(from_xy[1], to_xy[1] + dy, dy))
-            if len(x_range) == 1:
-                x_range = x_range * len(y_range)
-            elif len(y_range) == 1:
-                y_range = y_range * len(x_range)
+    Returns:
+        numpy.array: array of shape (lines, 2, 2) with the lines clipped to
+                     the box; lines outside the box are dropped
 
-            for x, y in zip(x_range, y_range):
-                points[tuple([x, y])] += 1
+    Example:
+    >>> clip_lines(numpy.array([[[0, 0], [9, 9]], [[9, 0], [9, 3]],
+    ...                         [[0, 5], [5, 0]]]), (2, 0), (5, 3))
+    array([[[2, 2],
+            [2, 2]],
+    <BLANKLINE>
+           [[3, 2],
+            [4, 1]]])
+    """
+    low, high = numpy.asarray(low), numpy.asarray(high)
+    start = lines[:, 0]
+    step = numpy.sign(lines[:, 1] - start)
+    length = numpy.abs(lines[:, 1] - start).max(axis=1)[:, None]
 
-    return points
+    # Per axis, the steps along the line at which it is within the box
+    inside = (low <= start) & (start < high)
+    first = numpy.select([step > 0, step < 0, inside],
+                         [low - start, start - high + 1, 0], length + 1)
+    last = numpy.select([step > 0, step < 0, inside],
+                        [high - 1 - start, start - low, length], -1)
+    first = numpy.maximum(first.max(axis=1), 0)[:, None]
+    last = numpy.minimum(last.min(axis=1)[:, None], length)
 
+    clipped = numpy.stack([start + step * first, start + step * last], axis=1)
+    return clipped[(first <= last)[:, 0]]
 
-def main():
-    lines = read_data()
 
-    points = lines_to_pointdict(lines, True)
-    num_overlap = sum(1 for ct in points.values() if ct >= 2)
+def _rasterize_tile(graph_name: str, shape: tuple, tile: tuple,
+                    lines: numpy.array) -> int:
+    shared = shared_memory.SharedMemory(name=graph_name)
+    try:
+        graph = numpy.ndarray(shape, dtype=numpy.int64, buffer=shared.buf)
+        return _rasterize(graph[tile[0]:tile[2], tile[1]:tile[3]],
+                          clip_lines(lines, tile[:2], tile[2:]) - tile[:2])
+    finally:
+        graph = None  # release the buffer before closing
+        shared.close()
 
-    print('*** First part of the assignment ***')
-    print(f'Number of overlaps >= 2 is: {num_overlap}')
 
-    points = lines_to_pointdict(lines, False)
-    num_overlap = sum(1 for ct in points.values() if ct >= 2)
+def _rasterize(graph: numpy.array, lines: numpy.array) -> int:
+    if len(lines):
+        graph += numpy.bincount(segment_indices(lines, graph.shape[1]),
+                                minlength=graph.size).reshape(graph.shape)
+    return int(numpy.count_nonzero(graph >= 2))
+
+
+def _tile_lines(lines: numpy.array, tile_size: int, shape: tuple) -> dict:
+    # Every line goes to the tiles along its path: the tile of its start,
+    # and the tiles it enters where x or y crosses a multiple of tile_size
+    start = lines[:, 0]
+    step = numpy.sign(lines[:, 1] - start)
+    length = numpy.abs(lines[:, 1] - start).max(axis=1)
+    first = numpy.where(step > 0, tile_size - start % tile_size,
+                        start % tile_size + 1)
+    crossings = numpy.where(step != 0, (length[:, None] - first) //
+                            tile_size + 1, 0).clip(0)
+    owner = [numpy.arange(len(lines))]
+    offset = [numpy.zeros(len(lines), dtype=numpy.int64)]
+    for axis in range(2):
+        count = crossings[:, axis]
+        owner.append(numpy.repeat(numpy.arange(len(lines)), count))
+        offset.append(numpy.repeat(first[:, axis], count) + tile_size * (
+            numpy.arange(count.sum()) -
+            numpy.repeat(numpy.cumsum(count) - count, count)))
+    owner, offset = numpy.concatenate(owner), numpy.concatenate(offset)
+    tile_x, tile_y = ((start[owner] + step[owner] * offset[:, None]) //
+                      tile_size).T
+
+    # Group the lines by tile; a line enters a tile only once
+    tile_ids = tile_x * -(-shape[1] // tile_size) + tile_y
+    order = numpy.lexsort((owner, tile_ids))
+    tile_ids, owner = tile_ids[order], owner[order]
+    tile_x, tile_y = tile_x[order], tile_y[order]
+    new = numpy.ones(len(order), dtype=bool)
+    new[1:] = (tile_ids[1:] != tile_ids[:-1]) | (owner[1:] != owner[:-1])
+    tile_ids, owner = tile_ids[new], owner[new]
+    tile_x, tile_y = tile_x[new], tile_y[new]
+
+    starts = numpy.flatnonzero(numpy.diff(tile_ids, prepend=-1))
+    result = {}
+    for tile_x, tile_y, group in zip(tile_x[starts], tile_y[starts],
+                                     numpy.split(owner, starts[1:])):
+        low = (int(tile_x) * tile_size, int(tile_y) * tile_size)
+        result[low + (min(low[0] + tile_size, shape[0]),
+                      min(low[1] + tile_size, shape[1]))] = lines[group]
+    return result
+
+
+def rasterize_tiles(lines: numpy.array, graph_name: str, shape: tuple,
+                    tile_size: int = TILE_SIZE, workers: int = None) -> int:
+    """Draws lines on a map in shared memory, tile by tile in parallel
+
+    The map is split into square tiles of tile_size points. Every line is
+    assigned to the tiles it crosses; each tile is rasterized by a worker
+    process that adds the points of the parts of its lines within the tile
+    to the map in shared memory. The tiles are disjoint, so the workers
+    never write to the same point. Every worker returns the number of
+    points covered at least twice in its tile, so the map itself is never
+    copied between processes.
+
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y) of horizontal, vertical or 45 degree
+                             lines, within shape
+        graph_name (str): name of the shared memory with the map: an int64
+                          array of the given shape
+        shape (tuple): (width, height) of the map
+        tile_size (int, optional): size of the tiles in points (per axis)
+        workers (int, optional): number of worker processes. Defaults to
+                                 the number of CPUs; with 1, the tiles are
+                                 rasterized in this process.
+
+    Returns:
+        int: number of points on the map covered by at least 2 lines
+    """
+    tiles = _tile_lines(lines, tile_size, shape) if len(lines) else {}
+    workers = min(workers or os.cpu_count(), max(len(tiles), 1))
+    AoC.trace(lambda: f'Rasterizing {len(lines)} lines in {len(tiles)} '
+                      f'tiles with {workers} workers')
+
+    arguments = ([graph_name] * len(tiles), [shape] * len(tiles),
+                 tiles.keys(), tiles.values())
+    if workers == 1:
+        return sum(map(_rasterize_tile, *arguments))
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        return sum(executor.map(_rasterize_tile, *arguments,
+                                chunksize=-(-len(tiles) // (4 * workers))))
+
+
+def _draw_tiles(lines: numpy.array, only_straight: bool, tile_size: int,
+                workers: int, copy_graph: bool) -> tuple:
+    if not len(lines):  # no map to draw, like count_overlaps
+        graph = numpy.zeros((0, 0), dtype=numpy.int64)
+        return graph if copy_graph else None, 0
+    shape = tuple(int(size) + 1 for size in lines.max(axis=(0, 1)))
+    if only_straight:
+        lines = lines[(lines[:, 0] == lines[:, 1]).any(axis=1)]
+    AoC.trace(lambda: f'Created map of size {shape}')
+
+    shared = shared_memory.SharedMemory(
+        create=True, size=max(numpy.prod(shape) * 8, 1))
+    try:
+        graph = numpy.ndarray(shape, dtype=numpy.int64, buffer=shared.buf)
+        graph[:] = 0
+        overlaps = rasterize_tiles(lines, shared.name, shape, tile_size,
+                                   workers)
+        AoC.trace(lambda: f'{overlaps} points covered by at least 2 lines')
+        return graph.copy() if copy_graph else None, overlaps
+    finally:
+        graph = None  # release the buffer before closing
+        shared.close()
+        shared.unlink()
+
+
+def lines_to_graph(lines: numpy.array, only_straight: bool = True,
+                   tile_size: int = TILE_SIZE,
+                   workers: int = None) -> numpy.array:
+    """Draws lines on a map that counts the lines at each point
+
+    See rasterize_tiles; use tiled_overlaps for just the number of
+    overlaps, which doesn't copy the map.
+
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y), with non-negative coordinates
+        only_straight (bool, optional): only draw horizontal and vertical
+                                        lines. Defaults to True.
+        tile_size (int, optional): size of the tiles in points (per axis)
+        workers (int, optional): number of worker processes. Defaults to
+                                 the number of CPUs.
+
+    Returns:
+        numpy.array: int array with the number of lines at each (x, y)
+
+    Example:
+    >>> lines_to_graph(numpy.array([[[0, 0], [0, 2]], [[0, 0], [2, 2]]]),
+    ...                only_straight=False, tile_size=2, workers=1)
+    array([[2, 1, 1],
+           [0, 1, 0],
+           [0, 0, 1]])
+    """
+    return _draw_tiles(lines, only_straight, tile_size, workers, True)[0]
+
+
+def tiled_overlaps(lines: numpy.array, only_straight: bool = True,
+                   tile_size: int = TILE_SIZE, workers: int = None) -> int:
+    """Counts the points where at least 2 lines overlap on a tiled map
+
+    The map is drawn in shared memory (see rasterize_tiles) and the counts
+    of the tiles are added up; the map is never copied.
+
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y), with non-negative coordinates
+        only_straight (bool, optional): only draw horizontal and vertical
+                                        lines. Defaults to True.
+        tile_size (int, optional): size of the tiles in points (per axis)
+        workers (int, optional): number of worker processes. Defaults to
+                                 the number of CPUs.
+
+    Returns:
+        int: number of points covered by at least 2 lines
+
+    Example:
+    >>> tiled_overlaps(numpy.array([[[0, 0], [0, 2]], [[0, 0], [2, 2]],
+    ...                             [[2, 0], [0, 2]]]), False, 2, 1)
+    3
+    >>> tiled_overlaps(numpy.zeros((0, 2, 2), dtype=int))
+    0
+    """
+    return _draw_tiles(lines, only_straight, tile_size, workers, False)[1]
+
+
+def count_overlaps(lines: numpy.array, chunk_points: int = CHUNK_POINTS,
+                   dense_factor: int = DENSE_FACTOR) -> tuple:
+    """Counts the points where at least 2 lines overlap
+
+    All points of all lines are rasterized once, as linear indices in the
+    bounding box of the lines, in chunks of about chunk_points points. The
+    horizontal and vertical lines come first, so part 1 only counts the
+    first chunks. The indices are counted with numpy.bincount when the
+    bounding box is at most dense_factor times the number of points; for
+    sparse lines, the indices are compressed to the points that occur
+    (numpy.unique).
+
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y)
+        chunk_points (int, optional): points per vectorized step
+        dense_factor (int, optional): maximum bounding box size (in points)
+                                      per line point for counting in a
+                                      dense array
+
+    Raises:
+        ValueError: for lines that aren't horizontal, vertical or diagonal
+
+    Returns:
+        tuple: (number of overlaps of horizontal and vertical lines,
+                number of overlaps of all lines)
+
+    Example:
+    >>> count_overlaps(parse_data(\'\'\'0,9 -> 5,9
+    ... 8,0 -> 0,8
+    ... 9,4 -> 3,4
+    ... 2,2 -> 2,1
+    ... 7,0 -> 7,4
+    ... 6,4 -> 2,0
+    ... 0,9 -> 2,9
+    ... 3,4 -> 1,4
+    ... 0,0 -> 8,8
+    ... 5,5 -> 8,2\'\'\'))
+    (5, 12)
+    """
+    if not len(lines):
+        return 0, 0
+
+    delta = numpy.abs(lines[:, 1] - lines[:, 0])
+    straight = (delta == 0).any(axis=1)
+    if not (straight | (delta[:, 0] == delta[:, 1])).all():
+        raise ValueError('Lines must be horizontal, vertical or diagonal')
+
+    # Horizontal and vertical lines first; coordinates relative to the
+    # bounding box of all lines
+    order = numpy.argsort(~straight, kind='stable')
+    lines = lines[order] - lines.min(axis=(0, 1))
+    num_straight = int(straight.sum())
+    width, height = (int(size) + 1 for size in lines.max(axis=(0, 1)))
+    lengths = delta[order].max(axis=1) + 1
+    dense = width * height <= dense_factor * lengths.sum()
+
+    # Chunks of about chunk_points points that don't mix the line types
+    ends = numpy.cumsum(lengths)
+    bounds = numpy.unique(numpy.append(numpy.searchsorted(
+        ends, numpy.arange(chunk_points, ends[-1], chunk_points)),
+        num_straight))
+
+    # Per line type: the counts per point (dense) or the points (sparse)
+    counts = {kind: numpy.zeros(width * height, dtype=numpy.int64) if dense
+              else [] for kind in ('straight', 'diagonal')}
+    for start, end in zip(numpy.append(0, bounds),
+                          numpy.append(bounds, len(lines))):
+        index = segment_indices(lines[start:end], height)
+        kind = 'straight' if end <= num_straight else 'diagonal'
+        if dense:
+            counts[kind] += numpy.bincount(index, minlength=width * height)
+        else:
+            counts[kind].append(index)
+
+    if dense:
+        overlaps = (counts['straight'],
+                    counts['straight'] + counts['diagonal'])
+    else:
+        overlaps = [numpy.unique(numpy.concatenate(points or [[]]),
+                                 return_counts=True)[1]
+                    for points in (counts['straight'],
+                                   counts['straight'] + counts['diagonal'])]
+    return tuple(int(numpy.count_nonzero(count >= 2)) for count in overlaps)
+
+
+# Lines of each family have a constant key (x, y) @ coefficients; their
+# points are traversed along axis 0 (x), or axis 1 (y) for vertical lines
+FAMILIES = {'horizontal': ((0, 1), 0), 'vertical': ((1, 0), 1),
+            'diagonal': ((1, -1), 0), 'antidiagonal': ((1, 1), 0)}
+
+
+def line_families(lines: numpy.array) -> dict:
+    """Splits lines into horizontal, vertical, diagonal and antidiagonal
+
+    Single points count as horizontal lines. Every line is turned so that
+    it runs in the direction of increasing x (y for vertical lines).
+
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y)
+
+    Raises:
+        ValueError: for lines that aren't horizontal, vertical or diagonal
+
+    Returns:
+        dict: {family (see FAMILIES): array of shape (lines, 2, 2)}
+    """
+    lines = numpy.asarray(lines, dtype=numpy.int64).reshape(-1, 2, 2)
+    dx, dy = (lines[:, 1] - lines[:, 0]).T
+    family = numpy.select([dy == 0, dx == 0, dx == dy, dx == -dy],
+                          range(len(FAMILIES)), -1)
+    if (family < 0).any():
+        raise ValueError('Lines must be horizontal, vertical or diagonal')
+
+    axis = (family == 1).astype(int)
+    along = numpy.arange(len(lines))
+    backwards = lines[along, 1, axis] < lines[along, 0, axis]
+    lines = numpy.where(backwards[:, None, None], lines[:, ::-1], lines)
+    return {name: lines[family == number]
+            for number, name in enumerate(FAMILIES)}
+
+
+def double_intervals(keys: numpy.array, low: numpy.array,
+                     high: numpy.array) -> tuple:
+    """Returns the intervals covered at least twice by intervals on lines
+
+    Every interval [low, high] lies on the line with its key. The start and
+    end of the intervals are sorted by key and position (a sweep along all
+    lines at once); the cumulative sum of +1 (start) and -1 (end) is the
+    coverage up to the next event. It drops to 0 at the end of each line.
+
+    Args:
+        keys (numpy.array): key of the line of each interval
+        low (numpy.array): first position of each interval
+        high (numpy.array): last position of each interval
+
+    Returns:
+        tuple: (keys, starts, ends) of disjoint intervals [start, end)
+               that are covered at least twice, sorted by key and start
+
+    Example:
+    >>> double_intervals(numpy.array([0, 0, 0, 1]), numpy.array([0, 2, 3, 0]),
+    ...                  numpy.array([5, 3, 9, 9]))
+    (array([0, 0, 0]), array([2, 3, 4]), array([3, 4, 6]))
+    """
+    position = numpy.concatenate([low, high + 1])
+    key = numpy.concatenate([keys, keys])
+    order = numpy.lexsort((position, key))
+    cover = numpy.cumsum(numpy.repeat([1, -1], len(keys))[order])
+    position, key = position[order], key[order]
+
+    double = (cover[:-1] >= 2) & (position[1:] > position[:-1])
+    return key[:-1][double], position[:-1][double], position[1:][double]
+
+
+def _in_intervals(intervals: tuple, keys: numpy.array,
+                  positions: numpy.array) -> numpy.array:
+    # Disjoint and sorted intervals: only the last interval that starts at
+    # or before a position (on the same line) can contain it
+    interval_keys, starts, ends = intervals
+    order = numpy.lexsort((
+        numpy.repeat([0, 1], [len(starts), len(positions)]),
+        numpy.concatenate([starts, positions]),
+        numpy.concatenate([interval_keys, keys])))
+    is_start = order < len(starts)
+    last_start = numpy.maximum.accumulate(numpy.where(is_start, order, -1))
+
+    query, interval = order[~is_start] - len(starts), last_start[~is_start]
+    found = interval >= 0
+    query, interval = query[found], interval[found]
+    inside = numpy.zeros(len(positions), dtype=bool)
+    inside[query] = ((interval_keys[interval] == keys[query]) &
+                     (positions[query] < ends[interval]))
+    return inside
+
+
+def _segment_nodes(low: numpy.array, high: numpy.array, size: int) -> tuple:
+    # Splits the leaf ranges [low, high) of a segment tree with size leaves
+    # (nodes numbered as a binary heap) into their O(log size) canonical
+    # nodes, bottom-up for all ranges at once
+    low, high = low + size, high + size
+    items = numpy.arange(len(low))
+    nodes, owners = [items[:0]], [items[:0]]
+    while len(items):
+        keep = low < high
+        low, high, items = low[keep], high[keep], items[keep]
+        left, right = (low & 1) == 1, (high & 1) == 1
+        nodes += [low[left], high[right] - 1]
+        owners += [items[left], items[right]]
+        low, high = (low + left) >> 1, (high - right) >> 1
+    return numpy.concatenate(nodes), numpy.concatenate(owners)
+
+
+def _stabbing_pairs(a1: numpy.array, b_low: numpy.array, b_high: numpy.array,
+                    b2: numpy.array, a_low: numpy.array, a_high: numpy.array,
+                    chunk_pairs: int):
+    # Yields the pairs (index1, index2) with a_low <= a1 <= a_high and
+    # b_low <= b2 <= b_high, see crossings
+    positions = numpy.unique(b2)
+    levels = max(len(positions) - 1, 0).bit_length()
+    width = len(a1) + 1  # ranks of a1 are below width
+    values = numpy.unique(a1)
+
+    # Every line1 is stored at the canonical nodes of its interval of b,
+    # sorted by node and by a within a node
+    nodes, owners = _segment_nodes(
+        numpy.searchsorted(positions, b_low, side='left'),
+        numpy.searchsorted(positions, b_high, side='right'), 1 << levels)
+    keys = nodes * width + numpy.searchsorted(values, a1[owners])
+    order = numpy.argsort(keys, kind='stable')
+    keys, owners = keys[order], owners[order]
+
+    # A line2 meets the lines1 at the nodes from its leaf to the root with
+    # a in [a_low, a_high], which are consecutive entries
+    path = ((numpy.searchsorted(positions, b2)[:, None] + (1 << levels)) >>
+            numpy.arange(levels + 1))
+    rank_low = numpy.searchsorted(values, a_low, side='left')[:, None]
+    rank_high = numpy.searchsorted(values, a_high, side='right')[:, None]
+    first = numpy.searchsorted(keys, path * width + rank_low).ravel()
+    count = numpy.searchsorted(keys, path * width + rank_high).ravel() - first
+    queries = numpy.repeat(numpy.arange(len(b2)), levels + 1)
+    found = count > 0
+    first, count, queries = first[found], count[found], queries[found]
+
+    # Chunks of about chunk_pairs pairs
+    ends = numpy.cumsum(count)
+    bounds = numpy.searchsorted(
+        ends, numpy.arange(chunk_pairs, ends[-1] if len(ends) else 0,
+                           chunk_pairs))
+    for start, end in zip(numpy.append(0, bounds),
+                          numpy.append(bounds, len(count))):
+        pairs = count[start:end]
+        entries = (numpy.repeat(first[start:end] - numpy.cumsum(pairs) +
+                                pairs, pairs) + numpy.arange(pairs.sum()))
+        yield owners[entries], numpy.repeat(queries[start:end], pairs)
+
+
+def crossings(lines1: numpy.array, family1: str, lines2: numpy.array,
+              family2: str, chunk_pairs: int = CHUNK_POINTS) -> numpy.array:
+    """Returns the points where lines of two different families cross
+
+    In the coordinates (a, b) = (key of family1, key of family2), lines1
+    are intervals of b at a fixed a and lines2 are intervals of a at a
+    fixed b (for diagonals, this is the frame (x - y, x + y)). The lines1
+    are stored in a segment tree over the b of lines2: every line1 at the
+    O(log n) nodes that make up its interval of b, sorted by a within a
+    node. This is the static form of a sweep along b with the active lines1
+    ordered by a: a line2 finds the lines1 that contain its b at the nodes
+    on the path from its leaf to the root, and of those the ones with a in
+    its interval by bisection. The run time is O((n + k) log n) for n lines
+    and k crossings. Diagonal and antidiagonal lines can cross between two
+    grid points, so only the lines with a and b of the same parity are
+    paired.
+
+    Args:
+        lines1 (numpy.array): lines of family1, see line_families
+        family1 (str): family of lines1, see FAMILIES
+        lines2 (numpy.array): lines of family2, see line_families
+        family2 (str): family of lines2, see FAMILIES
+        chunk_pairs (int, optional): pairs per vectorized step
+
+    Returns:
+        numpy.array: array of shape (points, 2) with the (x, y) of every
+                     crossing (repeated for every pair of lines crossing)
+
+    Example:
+    >>> crossings(numpy.array([[[0, 0], [3, 3]]]), 'diagonal',
+    ...           numpy.array([[[0, 3], [3, 0]], [[0, 2], [2, 0]]]),
+    ...           'antidiagonal')
+    array([[1, 1]])
+
+    Long lines that are far apart cost no pairs (this took seconds when all
+    lines1 within the interval of a of a line2 were checked):
+    >>> n = 8000
+    >>> horizontal = numpy.array([[[0, y], [10**6, y]] for y in range(n)])
+    >>> vertical = numpy.array([[[2 * 10**6 + x, 0], [2 * 10**6 + x, n]]
+    ...                         for x in range(n)])
+    >>> crossings(horizontal, 'horizontal', vertical, 'vertical').shape
+    (0, 2)
+    """
+    (p1, q1), _ = FAMILIES[family1]
+    (p2, q2), _ = FAMILIES[family2]
+    a1 = lines1[:, 0] @ (p1, q1)
+    b_low, b_high = numpy.sort(lines1 @ (p2, q2), axis=1).T
+    b2 = lines2[:, 0] @ (p2, q2)
+    a_low, a_high = numpy.sort(lines2 @ (p1, q1), axis=1).T
+
+    # Solve p1 x + q1 y = a, p2 x + q2 y = b; the crossing is on the grid
+    # if det divides both (only diagonal and antidiagonal have det = +-2)
+    det = p1 * q2 - q1 * p2
+    if abs(det) == 2:
+        groups = [(a1 % 2 == parity, b2 % 2 == parity) for parity in (0, 1)]
+    else:
+        groups = [(numpy.ones(len(a1), dtype=bool),
+                   numpy.ones(len(b2), dtype=bool))]
+
+    points = [numpy.zeros((0, 2), dtype=numpy.int64)]
+    for group1, group2 in groups:
+        index1, index2 = numpy.flatnonzero(group1), numpy.flatnonzero(group2)
+        for pair1, pair2 in _stabbing_pairs(
+                a1[index1], b_low[index1], b_high[index1], b2[index2],
+                a_low[index2], a_high[index2], chunk_pairs):
+            a, b = a1[index1[pair1]], b2[index2[pair2]]
+            points.append(numpy.stack([a * q2 - q1 * b, p1 * b - a * p2],
+                                      axis=1) // det)
+
+    return numpy.concatenate(points)
+
+
+def sweep_overlaps(lines: numpy.array,
+                   chunk_pairs: int = CHUNK_POINTS) -> tuple:
+    """Counts the points where at least 2 lines overlap, without a map
+
+    The points covered twice are:
+    - the intervals covered twice by lines of the same family (collinear
+      overlaps), see double_intervals, and
+    - the crossings of lines of different families, see crossings.
+    A crossing that lies in the double intervals of k families is counted
+    k times in the first; it is counted once by subtracting k - 1 when
+    k > 1 and adding 1 when k == 0. The run time depends on the number of
+    lines and crossings, not on the range of the coordinates.
+
+    Args:
+        lines (numpy.array): array of shape (lines, 2, 2) with from and to
+                             (x, y)
+        chunk_pairs (int, optional): pairs per vectorized step
+
+    Raises:
+        ValueError: for lines that aren't horizontal, vertical or diagonal
+
+    Returns:
+        tuple: (number of overlaps of horizontal and vertical lines,
+                number of overlaps of all lines)
+
+    Example:
+    >>> sweep_overlaps(parse_data(\'\'\'0,9 -> 5,9
+    ... 8,0 -> 0,8
+    ... 9,4 -> 3,4
+    ... 2,2 -> 2,1
+    ... 7,0 -> 7,4
+    ... 6,4 -> 2,0
+    ... 0,9 -> 2,9
+    ... 3,4 -> 1,4
+    ... 0,0 -> 8,8
+    ... 5,5 -> 8,2\'\'\') + 10**9)
+    (5, 12)
+    """
+    families = line_families(lines)
+    doubles = {}
+    for family, family_lines in families.items():
+        coefficients, axis = FAMILIES[family]
+        doubles[family] = double_intervals(family_lines[:, 0] @ coefficients,
+                                           family_lines[:, 0, axis],
+                                           family_lines[:, 1, axis])
+
+    overlaps = []
+    for names in (('horizontal', 'vertical'), tuple(FAMILIES)):
+        points = numpy.unique(numpy.concatenate(
+            [crossings(families[family1], family1, families[family2],
+                       family2, chunk_pairs)
+             for family1, family2 in itertools.combinations(names, 2)]),
+            axis=0)
+        within = sum(_in_intervals(doubles[family],
+                                   points @ FAMILIES[family][0],
+                                   points[:, FAMILIES[family][1]])
+                     .astype(int) for family in names)
+        collinear = sum(int((doubles[family][2] - doubles[family][1]).sum())
+                        for family in names)
+        overlaps.append(collinear - int(numpy.maximum(within - 1, 0).sum()) +
+                        int(numpy.count_nonzero(within == 0)))
+
+    AoC.trace(lambda: f'Sweep: {sum(map(len, families.values()))} lines, '
+                      f'{len(points)} crossings')
+    return tuple(overlaps)
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        lines = AoC.cached_parse(data, parse_data)
+
+    # Both parts are solved with the same rasterization of the lines; long
+    # lines are cheaper to intersect than to rasterize
+    with AoC.phase('part 1 and 2'):
+        lengths = numpy.abs(lines[:, 1] - lines[:, 0]).max(axis=1) + 1
+        if lengths.sum() >= SWEEP_LENGTH * max(len(lines), 1):
+            num_overlap1, num_overlap2 = sweep_overlaps(lines)
+        else:
+            num_overlap1, num_overlap2 = count_overlaps(lines)
+
+    return num_overlap1, num_overlap2
+
+
+def main():
+    with AoC.parse_cache():
+        num_overlap1, num_overlap2 = solve(AoC.read_input(IMPORT_FILE))
+
+    print('*** First part of the assignment ***')
+    print(f'Number of overlaps >= 2 is: {num_overlap1}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Number of overlaps >= 2 is: {num_overlap}')
+    print(f'Number of overlaps >= 2 is: {num_overlap2}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
@@ -3,15 +3,16 @@ Day 6 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/6
 """
 
+import functools
 import numpy as np
-import logging
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '06.input'
 JUV_TIMER = 8
 SIMULATION_LENGTH1 = 80
 SIMULATION_LENGTH2 = 256
+POWER_CACHE_SIZE = 128  # cached powers of TRANSITION_MATRIX
 TRANSITION_MATRIX = np.array([
     # 0  1  2  3  4  5  6  7  8
     [0, 1, 0, 0, 0, 0, 0, 0, 0],  # 0; from 1 to 0
@@ -24,6 +25,9 @@ TRANSITION_MATRIX = np.array([
     [0, 0, 0, 0, 0, 0, 0, 0, 1],  # 7; from 8 to 7
     [1, 0, 0, 0, 0, 0, 0, 0, 0],  # 8; from 0 to 8
 ])
+# Characteristic polynomial of TRANSITION_MATRIX: x ** 9 = x ** 2 + 1, as
+# the coefficients of x ** 0 ... x ** 8
+RECURRENCE = (1, 0, 1, 0, 0, 0, 0, 0, 0)
 
 """
 Old simulation approach.
@@ -60,38 +64,230 @@ def simulate_fish(timers: np.array,
 """
 
 
-def calculate_fish(timers: np.array,
-                   sim_length: int) -> int:
+def power_mod_characteristic(exponent: int, modulus: int = None) -> list:
+    """Returns x ** exponent modulo the characteristic polynomial
+
+    The remainder is computed by square-and-multiply on polynomials of
+    degree < 9 with Python ints, reducing every product with
+    x ** 9 = x ** 2 + 1 (so the work grows with log(exponent) and the size
+    of the numbers, not with exponent itself).
+
+    Args:
+        exponent (int): power of x (>= 0)
+        modulus (int, optional): reduce the coefficients modulo modulus
+
+    Returns:
+        list[int]: coefficients of x ** 0 ... x ** 8 of the remainder
+
+    Example:
+    >>> power_mod_characteristic(10)
+    [0, 1, 0, 1, 0, 0, 0, 0, 0]
+    >>> np.poly(TRANSITION_MATRIX).round().astype(int).tolist()[::-1] == \\
+    ...     [-coefficient for coefficient in RECURRENCE] + [1]
+    True
+    """
+    degree = len(RECURRENCE)
+    remainder = [1] + [0] * (degree - 1)
+    for bit in bin(exponent)[2:]:
+        # Square: every product of two different coefficients occurs twice
+        product = [0] * (2 * degree - 1)
+        for i, a in enumerate(remainder):
+            if a:
+                product[2 * i] += a * a
+                for j in range(i + 1, degree):
+                    if remainder[j]:
+                        product[i + j] += 2 * a * remainder[j]
+        if bit == '1':
+            product.insert(0, 0)  # times x
+
+        # Reduce the highest powers with x ** degree = RECURRENCE . x ** i
+        for power in range(len(product) - 1, degree - 1, -1):
+            if product[power]:
+                for i, coefficient in enumerate(RECURRENCE):
+                    if coefficient:
+                        product[power - degree + i] += \
+                            coefficient * product[power]
+        remainder = product[:degree]
+        if modulus:
+            remainder = [coefficient % modulus for coefficient in remainder]
+
+    return remainder
+
+
+def calculate_fish(timers: np.array, sim_length: int,
+                   modulus: int = None) -> int:
     """Calculates how many fish there are after sim_length of time
 
+    The fish counts per timer value satisfy the recurrence of the
+    characteristic polynomial of TRANSITION_MATRIX, x ** 9 - x ** 2 - 1. So
+    (Cayley-Hamilton) the counts after sim_length days are a combination
+    of the counts after 0 ... 8 days, with the coefficients of
+    x ** sim_length modulo that polynomial. To save the largest
+    multiplications, the last squaring isn't reduced: with
+    s = x ** (sim_length // 2), the total is the sum of s_i * s_j times
+    the total after i + j (+ 1 for odd sim_length) days. The result is
+    exact for any sim_length (Python ints), or modulo modulus.
+
     Args:
         timers (np.array): list of timers. One element for each fish
         sim_length (int): duration of the simulation
+        modulus (int, optional): return the number modulo modulus
 
     Returns:
         int: total number of fish at the end of the simulation
+
+    Example:
+    >>> calculate_fish(np.array([3, 4, 3, 1, 2]), 18)
+    26
+    >>> calculate_fish(np.array([3, 4, 3, 1, 2]), 10**6, 10**9 + 7) == \\
+    ...     calculate_fish(np.array([3, 4, 3, 1, 2]), 10**6) % (10**9 + 7)
+    True
+    """
+    vector = np.bincount(timers, minlength=JUV_TIMER + 1).astype(object)
+    AoC.trace(lambda: f'Converted {timers=} to {vector} counts.')
+
+    for _ in range(sim_length % 2):
+        vector = TRANSITION_MATRIX.dot(vector)
+    totals = []
+    for _ in range(2 * len(RECURRENCE) - 1):
+        totals.append(sum(vector))
+        vector = TRANSITION_MATRIX.dot(vector)
+
+    half = power_mod_characteristic(sim_length // 2, modulus)
+    fish_count = sum(a * sum(b * total for b, total in zip(half, totals[i:]))
+                     for i, a in enumerate(half))
+    AoC.trace(lambda: f'After {sim_length=}: {fish_count} fish.')
+
+    return fish_count % modulus if modulus else fish_count
+
+
+@functools.lru_cache(maxsize=POWER_CACHE_SIZE)
+def transition_power(exponent: int, modulus: int = None) -> np.array:
+    """Returns TRANSITION_MATRIX ** (2 ** exponent), exact or modulo modulus
+
+    The powers are computed by repeated squaring and cached, so the powers
+    up to 2 ** exponent are reused by later calls.
+
+    Args:
+        exponent (int): binary exponent of the power
+        modulus (int, optional): reduce the entries modulo modulus
+
+    Returns:
+        np.array: 9x9 array of Python ints (dtype object)
+    """
+    if exponent == 0:
+        power = TRANSITION_MATRIX.astype(object)
+    else:
+        power = transition_power(exponent - 1, modulus)
+        power = power.dot(power)
+    return power % modulus if modulus else power
+
+
+def calculate_fish_batch(populations: list, sim_lengths: list,
+                         modulus: int = None) -> list:
+    """Calculates the number of fish for many populations and durations
+
+    The timers of all populations are counted per population in one
+    np.bincount (offset by JUV_TIMER + 1 per population). Then, per bit of
+    the durations, all histograms with that bit set are multiplied at once
+    by the cached power TRANSITION_MATRIX ** (2 ** bit). This is done in
+    int64 when the counts can't overflow, and with Python ints otherwise.
+
+    Args:
+        populations (list[np.array]): timers of the fish of each query
+        sim_lengths (list[int]): duration of the simulation of each query
+        modulus (int, optional): return the numbers modulo modulus
+
+    Raises:
+        ValueError: for timers outside 0 ... JUV_TIMER
+
+    Returns:
+        list[int]: total number of fish at the end of each simulation
+
+    Example:
+    >>> calculate_fish_batch([np.array([3, 4, 3, 1, 2]), np.array([0])],
+    ...                      [18, 256])
+    [26, 6703087164]
+    """
+    sizes = [len(timers) for timers in populations]
+    timers = np.concatenate([np.asarray(timers, dtype=int)
+                             for timers in populations] + [[]]).astype(int)
+    if len(timers) and not 0 <= timers.min() <= timers.max() <= JUV_TIMER:
+        raise ValueError(f'Timers must be 0 ... {JUV_TIMER}')
+    states = JUV_TIMER + 1
+    counts = np.bincount(
+        timers + np.repeat(np.arange(len(sizes)) * states, sizes),
+        minlength=len(sizes) * states).reshape(-1, states)
+    sim_lengths = np.asarray(sim_lengths, dtype=object)
+
+    # A fish with timer 0 has the most offspring
+    longest = int(max(sim_lengths, default=0))
+    if modulus:
+        fits = states * (modulus - 1) ** 2 < 2**63
+    else:
+        fits = max(sizes, default=0) * \
+            calculate_fish(np.zeros(1, dtype=int), longest) < 2**63
+    counts = counts.astype(np.int64 if fits else object)
+    if modulus:
+        counts %= modulus
+    AoC.trace(lambda: f'{len(sizes)} queries of up to {longest} days in '
+                      f'{counts.dtype}')
+
+    for bit in range(longest.bit_length()):
+        query = np.flatnonzero((sim_lengths >> bit) & 1)
+        if len(query):
+            power = transition_power(bit, modulus).astype(counts.dtype)
+            counts[query] = counts[query] @ power.T
+            if modulus:
+                counts[query] %= modulus
+
+    return [int(count) % modulus if modulus else int(count)
+            for count in counts.sum(axis=1)]
+
+
+def parse_timers(data: str) -> np.array:
+    """Parse the comma separated fish timers from the puzzle input
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        np.array: array of timers
     """
-    vector = np.array([sum(timers == age) for age in range(JUV_TIMER + 1)])
-    logging.debug(f'Converted {timers=} to {vector} counts.')
+    return np.array(AoC.as_text(data).strip().split(','), dtype=int)
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        timers = parse_timers(data)
+
+    with AoC.phase('part 1'):
+        fish_count1 = calculate_fish(timers, SIMULATION_LENGTH1)
 
-    trans_matrix = np.linalg.matrix_power(TRANSITION_MATRIX, sim_length)
-    end_counts = trans_matrix.dot(vector)
-    logging.debug(f'After {sim_length=}, {timers=} is: {end_counts=}.')
+    with AoC.phase('part 2'):
+        fish_count2 = calculate_fish(timers, SIMULATION_LENGTH2)
 
-    return end_counts.sum()
+    return int(fish_count1), int(fish_count2)
 
 
 def main():
-    timers = np.loadtxt(IMPORT_FILE, dtype=int, delimiter=',')
-    fish_count = calculate_fish(timers, SIMULATION_LENGTH1)
+    fish_count1, fish_count2 = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
-    print(f'Number of fish after {SIMULATION_LENGTH1} days: {fish_count}.')
+    print(f'Number of fish after {SIMULATION_LENGTH1} days: {fish_count1}.')
 
-    fish_count = calculate_fish(timers, SIMULATION_LENGTH2)
     print('\n*** Second part of the assignment ***')
-    print(f'Number of fish after {SIMULATION_LENGTH2} days: {fish_count}.')
+    print(f'Number of fish after {SIMULATION_LENGTH2} days: {fish_count2}.')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
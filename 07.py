@@ -3,57 +3,237 @@ Day 7 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/7
 """
 
+import itertools
+import sys
 import numpy as np
-import logging
-logging.basicConfig(level=logging.DEBUG)
+import AoC
 
 
 IMPORT_FILE = '07.input'
+CHUNK_BYTES = 2**24  # bytes of input per step of count_positions
 
 
-def distance_to_fuel(positions: np.array,
-                     pos: int) -> int:
-    """Returns fuel needed for all elements to travel from positions to pos
-    For distance d, this is sum(range(d+1)) = d * (d + 1) / 2
+def triangular_fuel(distances: np.array) -> np.array:
+    """Returns the fuel to travel distances d: 1 + 2 + ... + d
 
     Args:
-        positions (np.array): array of positions
+        distances (np.array): distances to travel
+
+    Returns:
+        np.array: d * (d + 1) / 2 for every distance d
+    """
+    return distances * (distances + 1) // 2
+
+
+def fuel_costs(counts: np.array, triangular: bool = False) -> np.array:
+    """Returns the fuel for all crabs to travel to every position
+
+    Moving one position to the right, the crabs at or left of it all need
+    one more step, so the fuel from the left is the prefix sum of the
+    cumulative counts (the fuel from the right likewise, from the right).
+    The triangular fuel d(d + 1) / 2 grows by d per step, so it is the
+    prefix sum of the linear fuel. All partial sums are at most the fuel
+    itself; they are int64 unless the fuel of the farthest position could
+    overflow it, then Python ints.
+
+    Args:
+        counts (np.array): number of crabs at each position 0, 1, ...
+        triangular (bool, optional): use triangular_fuel instead of the
+                                     distance as fuel. Defaults to False.
+
+    Returns:
+        np.array: fuel needed to travel to each position 0, 1, ...
+
+    Example:
+    >>> counts = np.bincount([16, 1, 2, 0, 4, 2, 7, 1, 2, 14])
+    >>> fuel_costs(counts)[[1, 2, 3, 10]]
+    array([41, 37, 39, 71])
+    >>> fuel_costs(counts, triangular=True)[[2, 5]]
+    array([206, 168])
+    >>> counts = np.zeros(100001, dtype=np.int64)
+    >>> counts[[99990, 100000]] = 5, 10**9
+    >>> fuel_costs(counts, triangular=True).min()
+    275
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    reach = len(counts) - 1
+    worst = int(counts.sum()) * (reach * (reach + 1) // 2 if triangular
+                                 else reach)
+    counts = counts.astype(np.int64 if worst < 2**63 else object)
+
+    # Crabs at or left (right) of each position, and their fuel to it
+    left = np.cumsum(counts)
+    right = np.cumsum(counts[::-1])[::-1]
+    fuel_left, fuel_right = np.zeros_like(left), np.zeros_like(right)
+    fuel_left[1:] = np.cumsum(left[:-1])
+    fuel_right[:-1] = np.cumsum(right[:0:-1])[::-1]
+
+    if triangular:
+        fuel_left = np.cumsum(fuel_left)
+        fuel_right = np.cumsum(fuel_right[::-1])[::-1]
+    return fuel_left + fuel_right
+
+
+def total_fuel(counts: np.array, pos: int, fuel: callable) -> int:
+    """Returns the fuel needed for all crabs to travel to pos
+
+    Args:
+        counts (np.array): number of crabs at each position 0, 1, ...
         pos (int): position to travel to
+        fuel (callable): fuel to travel distances (vectorized), e.g.
+                         triangular_fuel
 
     Returns:
         int: amount of fuel needed
     """
-    distances = np.abs(positions - pos)
-    return sum(map(lambda d: d * (d + 1) / 2, distances))
+    distances = np.abs(np.arange(len(counts)) - pos)
+    return counts @ fuel(distances)
+
 
+def find_optimal_position(counts: np.array, fuel: callable) -> tuple:
+    """Finds the position with the least fuel by ternary search
 
-def find_optimal_position(positions: np.array) -> int:
-    """Finds the optimal position by brute force
+    The total fuel is convex in the position when fuel is convex in the
+    distance, so the search range shrinks by a third per step. When both
+    probes need the same fuel, the minimum lies between them.
 
     Args:
-        positions (np.array): positions
+        counts (np.array): number of crabs at each position 0, 1, ...
+        fuel (callable): convex fuel to travel distances (vectorized)
 
     Returns:
-        int: optimal position
+        tuple: (optimal position, fuel needed)
+
+    Example:
+    >>> counts = np.bincount([16, 1, 2, 0, 4, 2, 7, 1, 2, 14])
+    >>> find_optimal_position(counts, triangular_fuel)
+    (5, 168)
+    >>> find_optimal_position(counts, lambda distances: distances ** 3)
+    (6, 2179)
     """
-    fuels = [distance_to_fuel(pos, positions)
-             for pos in range(len(positions))]
-    return fuels.index(min(fuels))
+    low, high = 0, len(counts) - 1
+    while high - low > 2:
+        third = (high - low) // 3
+        fuel_low = total_fuel(counts, low + third, fuel)
+        fuel_high = total_fuel(counts, high - third, fuel)
+        if fuel_low < fuel_high:
+            high -= third + 1
+        elif fuel_low > fuel_high:
+            low += third + 1
+        else:
+            low, high = low + third, high - third
+
+    return min(((pos, total_fuel(counts, pos, fuel))
+                for pos in range(low, high + 1)), key=lambda pair: pair[1])
+
+
+def _read_blocks(data, chunk_bytes: int):
+    if hasattr(data, 'read'):
+        while block := data.read(chunk_bytes):
+            yield AoC.as_bytes(block)
+    else:
+        data = memoryview(AoC.as_bytes(data))
+        for start in range(0, len(data), chunk_bytes):
+            yield bytes(data[start:start + chunk_bytes])
+
+
+def count_positions(data, chunk_bytes: int = CHUNK_BYTES) -> np.array:
+    """Counts the crabs per position in the comma separated puzzle input
+
+    The input is read in blocks of chunk_bytes; the numbers of each block
+    (up to its last comma) are parsed and counted in one vectorized step,
+    so the memory use depends on the range of the positions, not on the
+    number of crabs.
+
+    Args:
+        data (str): puzzle input (str or bytes), or a file to read it from
+        chunk_bytes (int, optional): bytes of input per step
+
+    Raises:
+        ValueError: if the input contains anything but non-negative numbers
+
+    Returns:
+        np.array: number of crabs at each position 0, 1, ...
+
+    Example:
+    >>> count_positions('16,1,2,0,4,2,7,1,2,14\\n', chunk_bytes=4)
+    array([1, 2, 3, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1])
+    """
+    counts = np.zeros(0, dtype=np.int64)
+    blocks = _read_blocks(data, chunk_bytes)
+    rest = b''
+    for block in itertools.chain(blocks, [None]):
+        if block is None:  # end of input
+            text, rest = rest, b''
+        else:
+            text = rest + block
+            cut = text.rfind(b',')
+            text, rest = text[:max(cut, 0)], text[cut + 1:]
+        if not text.strip():
+            continue
+
+        positions = AoC.parse_numbers(text, sep=',', dtype=np.int64)
+        block_counts = np.bincount(positions)
+        if len(block_counts) > len(counts):
+            counts = np.concatenate(
+                [counts, np.zeros(len(block_counts) - len(counts),
+                                  dtype=np.int64)])
+        counts[:len(block_counts)] += block_counts
+
+    AoC.trace(lambda: f'{counts.sum()} crabs at {len(counts)} positions')
+    return counts
+
+
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        counts = count_positions(data)
+
+    with AoC.phase('part 1'):
+        fuels = fuel_costs(counts)
+        opt_pos = fuels.argmin()
+        sum_dist = fuels[opt_pos]
+        AoC.trace(lambda: f'Optimal position for part 1 is {opt_pos}')
+
+    with AoC.phase('part 2'):
+        fuels = fuel_costs(counts, triangular=True)
+        opt_pos = fuels.argmin()
+        sum_fuel = fuels[opt_pos]
+        AoC.trace(lambda: f'Optimal position for part 2 is {opt_pos}')
+
+    return int(sum_dist), int(sum_fuel)
 
 
 def main():
-    positions = np.loadtxt(IMPORT_FILE, dtype=int, delimiter=',')
+    sum_dist, sum_fuel = solve(AoC.read_input(IMPORT_FILE))
 
-    opt_pos = np.median(positions)
-    sum_dist = np.abs(positions - opt_pos).sum()
     print('*** First part of the assignment ***')
-    print(f'Optimal position is {opt_pos}; sum distances = {sum_dist}')
+    print(f'Sum of distances to the optimal position = {sum_dist}')
 
-    opt_pos = find_optimal_position(positions)
-    sum_fuel = distance_to_fuel(positions, opt_pos)
     print('\n*** Second part of the assignment ***')
-    print(f'Optimal position is {opt_pos}; sum distances = {sum_fuel}')
+    print(f'Fuel needed to reach the optimal position = {sum_fuel}')
+
+
+def stream_main(file=None, chunk_bytes: int = CHUNK_BYTES):
+    """Prints the answers for crab positions read from file (default: stdin)"""
+    counts = count_positions(sys.stdin.buffer if file is None else file,
+                             chunk_bytes)
+    print(f'Sum of distances to the optimal position = '
+          f'{fuel_costs(counts).min()}')
+    print(f'Fuel needed to reach the optimal position = '
+          f'{fuel_costs(counts, triangular=True).min()}')
 
 
 if __name__ == "__main__":
-    main()
+    AoC.setup_logging()
+    if sys.argv[1:] == ['--stream']:  # e.g. python 07.py --stream < 07.input
+        stream_main()
+    else:
+        main()
@@ -4,13 +4,25 @@ See: https://adventofcode.com/2021/day/8
 """
 
 import numpy as np
-import logging
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '08.input'
 
 
+def parse_entries(data: str) -> np.array:
+    """Parse the observed patterns and digit outputs from the puzzle input
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        np.array: 2d array of strings; one row per entry
+    """
+    return np.array([line.split()
+                     for line in AoC.as_text(data).splitlines() if line])
+
+
 def _l147_score(digit: str, digit147: list) -> tuple:
     """Returns the length of digit and the number of sement matches with 1,4,7
 
@@ -21,7 +33,7 @@ def _l147_score(digit: str, digit147: list) -> tuple:
     Returns:
         tuple: (length, matching segments with 1, idem with 4, idem with 7)
     """
-    logging.debug(f'{digit147=}')
+    AoC.trace(lambda: f'{digit147=}')
     return tuple([len(digit)] +
                  [len(set(digit) & set(num)) for num in digit147])
 
@@ -62,33 +74,50 @@ def create_mapping(observed: np.array) -> dict:
         if l147_score in mapping2:
             mapping[code] = mapping2[l147_score]
 
-    logging.debug(f'Mapping complete: {mapping}')
+    AoC.trace(lambda: f'Mapping complete: {mapping}')
     assert len(mapping) == 10
 
     return mapping
 
 
-def main():
-    entries = np.loadtxt(IMPORT_FILE, dtype=str)
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        entries = AoC.cached_parse(data, parse_entries)
 
     count = 0       # count of digits 2,3,4 and 7 in the digits (assignment 1)
     sum_digits = 0  # sum of the digits (assignment 2)
 
-    # Loop over all entries in the input file
-    for entry in entries:
-        entry = np.fromiter([''.join(sorted(e))
-                             for e in entry], dtype=entry.dtype)
+    # Both parts are solved in the same loop over all entries
+    with AoC.phase('part 1 and 2'):
+        for entry in entries:
+            entry = np.fromiter([''.join(sorted(e))
+                                 for e in entry], dtype=entry.dtype)
 
-        # Split in observed segments and the digit readout
-        observed, digits = entry[: 10], entry[11:]
+            # Split in observed segments and the digit readout
+            observed, digits = entry[: 10], entry[11:]
 
-        # Assignment 1
-        count += sum([len(digit) in (2, 3, 4, 7)
-                     for digit in digits])
+            # Assignment 1
+            count += sum([len(digit) in (2, 3, 4, 7)
+                         for digit in digits])
 
-        # Assignment 2
-        mapping = create_mapping(observed)
-        sum_digits += int(''.join(str(mapping[d]) for d in digits))
+            # Assignment 2
+            mapping = create_mapping(observed)
+            sum_digits += int(''.join(str(mapping[d]) for d in digits))
+
+    return int(count), sum_digits
+
+
+def main():
+    with AoC.parse_cache():
+        count, sum_digits = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
     print(f'Number of digits with length 1, 4, 7 or 8: {count}')
@@ -98,4 +127,5 @@ def main():
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
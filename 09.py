@@ -4,32 +4,25 @@ Day 9 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/9
 """
 
-from pathlib import Path
 import numpy as np
-import logging
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '09.input'
 
 
-def import_heights(filename: str) -> np.array:
-    """Import file from filename into a numpy array
+def parse_heights(data: str) -> np.array:
+    """Parse the puzzle input into a numpy array
 
-    The file is assumed to contain values from 0-9 without separators.
+    The input is assumed to contain values from 0-9 without separators.
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
-        np.array: Numpy array with the data from the file
+        np.array: Numpy uint8 array with the puzzle input
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
-        return np.array([[int(c) for c in list(s.strip())] for s in f])
+    return AoC.digit_grid(data)
 
 
 def sum_lows(heights: np.array) -> int:
@@ -55,7 +48,7 @@ def sum_lows(heights: np.array) -> int:
             [9, 8, 9, 9, 9, 6, 5, 6, 7, 8]]))
     15
     """
-    logging.debug(f'Finding low points for {heights}')
+    AoC.trace(lambda: f'Finding low points for {heights}')
     # Pad heights with 10's
     padded_heights = np.pad(heights, pad_width=1,
                             mode='constant', constant_values=10)
@@ -67,10 +60,11 @@ def sum_lows(heights: np.array) -> int:
           for c in range(1, heights.shape[1] + 1)]
          for r in range(1, heights.shape[0] + 1)])
 
-    logging.debug(f'Boolean array with True at Low points: {min_heights=}')
+    AoC.trace(lambda: f'Boolean array with True at Low points: '
+                      f'{min_heights=}')
 
     # Sum the points where heigt == min_height + 1
-    return sum(heights[min_heights] + 1)
+    return int((heights[min_heights] + 1).sum())
 
 
 def fill_count(heights: np.array) -> np.array:
@@ -104,7 +98,7 @@ def fill_count(heights: np.array) -> np.array:
 
     """
     # Create a copy of heights. Set border to -1 and fill area's to -2
-    h = np.copy(heights)
+    h = heights.astype(int)
     h[h == 9] = -1
     h[h != -1] = -2
 
@@ -117,8 +111,8 @@ def fill_count(heights: np.array) -> np.array:
         indices = [list(zip(*np.where(h == -2)))[0]]
         h[indices[0]] = area_counter
 
-        logging.debug(f'Filling area {area_counter}, '
-                      f'starting at index {indices[0]}')
+        AoC.trace(lambda: f'Filling area {area_counter}, '
+                          f'starting at index {indices[0]}')
 
         # Keep going until the area can't be expanded anymore
         while area_size > old_area_size:
@@ -134,7 +128,8 @@ def fill_count(heights: np.array) -> np.array:
                         indices.append(tuple([r + dr, c + dc]))
                         area_size += 1
 
-        logging.debug(f'Filled area {area_counter} of size {area_size}')
+        AoC.trace(lambda: f'Filled area {area_counter} '
+                          f'of size {area_size}')
 
         # Go to the next area
         area_counter += 1
@@ -145,28 +140,47 @@ def fill_count(heights: np.array) -> np.array:
     return h
 
 
-def main():
-    heights = import_heights(IMPORT_FILE)
-    low_sum = sum_lows(heights)
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
 
-    print('*** First part of the assignment ***')
-    print(f'Sum of lows is {low_sum}')
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        heights = parse_heights(data)
 
-    # Mark all area's, count their sizes
-    marked = fill_count(heights)
-    area_counts = dict(zip(*np.unique(marked, return_counts=True)))
-    del area_counts[0]  # remove the border itself from the counts
+    with AoC.phase('part 1'):
+        low_sum = sum_lows(heights)
 
-    logging.debug(f'Found areas (index: size): {area_counts}')
+    with AoC.phase('part 2'):
+        # Mark all area's, count their sizes
+        marked = fill_count(heights)
+        area_counts = dict(zip(*np.unique(marked, return_counts=True)))
+        del area_counts[0]  # remove the border itself from the counts
 
-    # Multiply the largest 3 sizes for the answer
-    product_largest_3 = np.prod(sorted(area_counts.values())[-3:])
+        AoC.trace(lambda: f'Found areas (index: size): {area_counts}')
+
+        # Multiply the largest 3 sizes for the answer
+        product_largest_3 = int(np.prod(sorted(area_counts.values())[-3:]))
+
+    return low_sum, product_largest_3
+
+
+def main():
+    low_sum, product_largest_3 = solve(AoC.read_input(IMPORT_FILE))
+
+    print('*** First part of the assignment ***')
+    print(f'Sum of lows is {low_sum}')
 
     print('\n*** Second part of the assignment ***')
     print(f'Sum of all digit outputs {product_largest_3}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     import doctest
     doctest.testmod()
     main()
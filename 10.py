@@ -4,9 +4,8 @@ Day 10 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/10
 """
 
-from pathlib import Path
-import logging
-logging.basicConfig(level=logging.INFO)
+import io
+import AoC
 
 
 IMPORT_FILE = '10.input'
@@ -28,20 +27,16 @@ CHUNK_CHARACTER_PAIRS = dict(zip(CHUNK__START_CHARACTERS,
                                  CHUNK_END_CHARACTERS))
 
 
-def import_lines(filename: str) -> list:
-    """Import file from filename into a list
+def parse_lines(data: str) -> list:
+    """Parse the puzzle input into a list
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
-        list: List of lines from the file
+        list: List of lines from the puzzle input
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
+    with io.StringIO(AoC.as_text(data)) as f:
         return [line.strip() for line in f]
 
 
@@ -94,21 +89,41 @@ def score_autocomplete(line: str) -> int:
     return sum(5 ** n * AUTOCOMPLETE_SCORES[c] for n, c in enumerate(stack))
 
 
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        lines = parse_lines(data)
+
+    with AoC.phase('part 1'):
+        sum_syntax_score = sum([score_syntax_errors(line) for line in lines])
+
+    with AoC.phase('part 2'):
+        autocomplete_scores = [score for score in
+                               [score_autocomplete(line) for line in lines]
+                               if score > 0]
+        median_score = sorted(autocomplete_scores)[
+            len(autocomplete_scores) // 2]
+
+    return sum_syntax_score, median_score
+
+
 def main():
-    lines = import_lines(IMPORT_FILE)
-    sum_syntax_score = sum([score_syntax_errors(line) for line in lines])
+    sum_syntax_score, median_score = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
     print(f'Sum of error scores is: {sum_syntax_score}')
 
-    autocomplete_scores = [score for score in
-                           [score_autocomplete(line) for line in lines]
-                           if score > 0]
-    median_score = sorted(autocomplete_scores)[len(autocomplete_scores) // 2]
-
     print('\n*** Second part of the assignment ***')
     print(f'Median score of autocomplete scores is: {median_score}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
@@ -4,10 +4,8 @@ Day 11 of Advent of Code 2021
 See: https://adventofcode.com/2021/day/11
 """
 
-from pathlib import Path
 import numpy as np
-import logging
-logging.basicConfig(level=logging.DEBUG)
+import AoC
 
 
 IMPORT_FILE = '11.input'
@@ -17,23 +15,18 @@ ADJACENT_OFFSETS = [(-1, -1), (-1, 0), (-1, 1),
                     (1, -1), (1, 0), (1, 1)]
 
 
-def import_energy(filename: str) -> np.array:
-    """Import file from filename into a numpy array
+def parse_energy(data: str) -> np.array:
+    """Parse the puzzle input into a numpy array
 
-    The file is assumed to contain values from 0-9 without separators.
+    The input is assumed to contain values from 0-9 without separators.
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
-        np.array: Numpy array with the data from the file
+        np.array: Numpy uint8 array with the puzzle input
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
-        return np.array([[int(c) for c in list(s.strip())] for s in f])
+    return AoC.digit_grid(data)
 
 
 def process_step(energy: np.array) -> np.array:
@@ -58,27 +51,45 @@ def process_step(energy: np.array) -> np.array:
     return energy
 
 
-def main():
-    energy = import_energy(IMPORT_FILE)
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        energy = parse_energy(data)
 
-    energy1 = np.copy(energy)
-    num_flashes = 0
-    for step in range(100):
-        energy1 = process_step(energy1)
-        num_flashes += len(energy1[energy1 == 0])
+    with AoC.phase('part 1'):
+        energy1 = np.copy(energy)
+        num_flashes = 0
+        for step in range(100):
+            energy1 = process_step(energy1)
+            num_flashes += len(energy1[energy1 == 0])
+
+    with AoC.phase('part 2'):
+        energy2 = np.copy(energy)
+        step = 0
+        while energy2.sum() > 0:
+            energy2 = process_step(energy2)
+            step += 1
+
+    return num_flashes, step
+
+
+def main():
+    num_flashes, step = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
     print(f'Number of flashes in 100 steps: {num_flashes}')
 
-    energy2 = np.copy(energy)
-    step = 0
-    while energy2.sum() > 0:
-        energy2 = process_step(energy2)
-        step += 1
-
     print('\n*** Second part of the assignment ***')
     print(f'All flashed after {step} steps')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
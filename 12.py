@@ -5,33 +5,28 @@ See: https://adventofcode.com/2021/day/12
 """
 
 import collections
-from pathlib import Path
-import logging
-logging.basicConfig(level=logging.INFO)
+import io
+import AoC
 
 
 IMPORT_FILE = '12.input'
 
 
-def import_graph(filename: str, directed=False) -> dict:
-    """Import directed graph from filename into a dict
+def parse_graph(data: str, directed=False) -> dict:
+    """Parse the graph from the puzzle input into a dict
 
-    The file is assumed to contain 'from'-'to'-pairs per line
+    The input is assumed to contain 'from'-'to'-pairs per line
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
         directed: indicates if edges are directed (True) or bi-directional
                   (False). The default is False = bi-directional edges.
 
     Returns:
         dict(list): dict with nodes as keys and a list of nodes for edges
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
     graph = dict()
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
+    with io.StringIO(AoC.as_text(data)) as f:
         for line in f:
             node1, node2 = line.strip().split('-')
             if node1 in graph:
@@ -98,25 +93,43 @@ def find_unique_paths(graph: dict,
                 if _node_allowed(path, node, start, end, extra_visit_rule):
                     paths.add(path + (node,))
             paths.remove(path)
-        logging.debug(f'{paths=}')
+        AoC.trace(lambda: f'{paths=}')
 
     return paths
 
 
-def main():
-    graph = import_graph(IMPORT_FILE)
-    logging.debug(f'{graph=}')
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
 
-    paths = find_unique_paths(graph, extra_visit_rule=False)
+    Args:
+        data (str): puzzle input (str or bytes)
 
-    print('*** First part of the assignment ***')
-    print(f'Found {len(paths)} unique paths')
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        graph = parse_graph(data)
+    AoC.trace(lambda: f'{graph=}')
+
+    with AoC.phase('part 1'):
+        paths1 = find_unique_paths(graph, extra_visit_rule=False)
 
-    paths = find_unique_paths(graph, extra_visit_rule=True)
+    with AoC.phase('part 2'):
+        paths2 = find_unique_paths(graph, extra_visit_rule=True)
+
+    return len(paths1), len(paths2)
+
+
+def main():
+    num_paths1, num_paths2 = solve(AoC.read_input(IMPORT_FILE))
+
+    print('*** First part of the assignment ***')
+    print(f'Found {num_paths1} unique paths')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Found {len(paths)} unique paths')
+    print(f'Found {num_paths2} unique paths')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
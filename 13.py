@@ -5,30 +5,25 @@ See: https://adventofcode.com/2021/day/13
 """
 
 import numpy as np
-from pathlib import Path
-import logging
-logging.basicConfig(level=logging.INFO)
+import io
+import AoC
 
 
 # IMPORT_FILE = '13.example.01.input'
 IMPORT_FILE = '13.input'
-SHAPE = (1311, 895)
 
 
-def import_sheet(filename: str) -> tuple:
-    """Import sheet points and fold instructions from filename into a tuple
+def parse_dots(data: str) -> tuple:
+    """Parse dot coordinates and fold instructions from the puzzle input
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
-        tuple: (numpy.array with dots, list of tuples with fold instructions)
+        tuple: (np.array of (x, y) dots, np.array of fold axes ('x'/'y'),
+                np.array of fold values)
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
+    with io.StringIO(AoC.as_text(data)) as f:
         # First process coordinates
         coords = []
         for line in f:
@@ -36,18 +31,60 @@ def import_sheet(filename: str) -> tuple:
                 break  # end of coordinates
             coords.append(tuple([int(c) for c in line.strip().split(',')]))
 
-        # Create array of bools and set point at coordinates to True
-        arr = np.zeros(shape=SHAPE, dtype=bool)
-        # arr = np.zeros(shape=np.array(coords).max(axis=0) + 1, dtype=bool)
-        arr[tuple(zip(*coords))] = True
-
-        # Next process folding instructions from the input file
+        # Next process folding instructions from the input
         folds = []
         for line in f:
             axis, value = line.strip().split('=')
             folds.append((axis[-1], int(value)))
 
-        return (arr, folds)
+    axes, values = zip(*folds) if folds else ((), ())
+    return (np.array(coords, dtype=int).reshape(-1, 2),
+            np.array(axes, dtype='<U1'), np.array(values, dtype=int))
+
+
+def parse_sheet(data: str) -> tuple:
+    """Parse sheet points and fold instructions from the puzzle input
+
+    The parsed input is cached when enabled (see AoC.parse_cache).
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (numpy.array with dots, list of tuples with fold instructions)
+    """
+    coords, axes, values = AoC.cached_parse(data, parse_dots)
+    folds = list(zip(axes.tolist(), values.tolist()))
+
+    # Create array of bools and set point at coordinates to True
+    arr = np.zeros(shape=sheet_shape(coords, folds), dtype=bool)
+    arr[coords[:, 0], coords[:, 1]] = True
+
+    return (arr, folds)
+
+
+def sheet_shape(coords: list, folds: list) -> tuple:
+    """Determine the shape of the sheet from the dots and fold instructions
+
+    The first fold along an axis is exactly in the middle of the sheet.
+
+    Args:
+        coords (list): list of (x, y) tuples with dots
+        folds (list): list of (axis, value) tuples with fold instructions
+
+    Returns:
+        tuple: (size in x-direction, size in y-direction)
+
+    Example:
+    >>> sheet_shape([(0, 0), (10, 14)], [('y', 7), ('x', 5)])
+    (11, 15)
+    """
+    shape = list(np.max(coords, axis=0) + 1)
+    for axis in (0, 1):
+        first_fold = [value for ax, value in folds if ax == 'xy'[axis]][:1]
+        if first_fold:
+            shape[axis] = 2 * first_fold[0] + 1
+    return tuple(shape)
 
 
 def split_and_fold(arr: np.array, axis: str, value: int) -> np.array:
@@ -83,21 +120,43 @@ def bool_print(arr: np.array) -> str:
                      for row in arr.T)
 
 
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        sheet, folding = parse_sheet(data)
+
+    with AoC.phase('part 1'):
+        sheet = split_and_fold(sheet, *folding[0])
+        num_dots = int(sheet.sum())
+
+    with AoC.phase('part 2'):
+        for fold in folding[1:]:
+            AoC.trace(lambda: f'Next fold: {fold=}; '
+                              f'shape before fold: {sheet.shape}')
+            sheet = split_and_fold(sheet, *fold)
+
+    return num_dots, bool_print(sheet)
+
+
 def main():
-    sheet, folding = import_sheet(IMPORT_FILE)
-    sheet = split_and_fold(sheet, *folding[0])
+    with AoC.parse_cache():
+        num_dots, drawing = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
-    print(f'Found {len(sheet[sheet])} dots after 1 fold')
-
-    for fold in folding[1:]:
-        logging.debug(f'Next fold: {fold=}; shape before fold: {sheet.shape}')
-        sheet = split_and_fold(sheet, *fold)
+    print(f'Found {num_dots} dots after 1 fold')
 
     print('\n*** Second part of the assignment ***')
     print('Found the following sheet with dots:\n')
-    print(bool_print(sheet))
+    print(drawing)
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
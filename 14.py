@@ -5,29 +5,24 @@ See: https://adventofcode.com/2021/day/14
 """
 
 import collections
-from pathlib import Path
-import logging
-logging.basicConfig(level=logging.INFO)
+import io
+import AoC
 
 
 # IMPORT_FILE = '14.example.input'
 IMPORT_FILE = '14.input'
 
 
-def import_polymer(filename: str) -> tuple:
-    """Import polymer template and reactions from filename into a tuple
+def parse_polymer(data: str) -> tuple:
+    """Parse polymer template and reactions from the puzzle input
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
         tuple: (template: str, dict) with template, reactions
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
+    with io.StringIO(AoC.as_text(data)) as f:
         # First get the template
         template = f.readline().strip()
         f.readline()  # empty line
@@ -84,32 +79,54 @@ def count_poly_char(poly_counter: dict) -> dict:
     return result
 
 
-def main():
-    template, reactions = import_polymer(IMPORT_FILE)
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
 
-    # Convert template to a counter of polymer duo characters
-    poly_counter = {key: template.count(key)
-                    for key in set([template[i:i+2]
-                                    for i in range(len(template) - 1)])}
-    logging.debug(f'{template=}\n{reactions=}\n{poly_counter=}')
+    Args:
+        data (str): puzzle input (str or bytes)
 
-    for i in range(10):
-        poly_counter = iterate(poly_counter, reactions)
-    logging.debug(f'Task 1: {poly_counter=} = {count_poly_char(poly_counter)}')
-    counts = count_poly_char(poly_counter).values()
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        template, reactions = parse_polymer(data)
+
+        # Convert template to a counter of polymer duo characters
+        poly_counter = {key: template.count(key)
+                        for key in set([template[i:i+2]
+                                        for i in range(len(template) - 1)])}
+    AoC.trace(lambda: f'{template=}\n{reactions=}\n{poly_counter=}')
+
+    with AoC.phase('part 1'):
+        for i in range(10):
+            poly_counter = iterate(poly_counter, reactions)
+        AoC.trace(lambda: f'Task 1: {poly_counter=} = '
+                          f'{count_poly_char(poly_counter)}')
+        counts = count_poly_char(poly_counter).values()
+        answer1 = max(counts) - min(counts)
+
+    with AoC.phase('part 2'):
+        # Add another 30 steps (40 - 10 = 30)
+        for i in range(30):
+            poly_counter = iterate(poly_counter, reactions)
+        AoC.trace(lambda: f'Task 2: {poly_counter=} = '
+                          f'{count_poly_char(poly_counter)}')
+        counts = count_poly_char(poly_counter).values()
+        answer2 = max(counts) - min(counts)
+
+    return answer1, answer2
 
-    print('*** First part of the assignment ***')
-    print(f'Max counts - min counts = {max(counts) - min(counts)}')
 
-    # Add another 30 steps (40 - 10 = 30)
-    for i in range(30):
-        poly_counter = iterate(poly_counter, reactions)
-    logging.debug(f'Task 2: {poly_counter=} = {count_poly_char(poly_counter)}')
-    counts = count_poly_char(poly_counter).values()
+def main():
+    answer1, answer2 = solve(AoC.read_input(IMPORT_FILE))
+
+    print('*** First part of the assignment ***')
+    print(f'Max counts - min counts = {answer1}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Max counts - min counts = {max(counts) - min(counts)}')
+    print(f'Max counts - min counts = {answer2}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
@@ -5,33 +5,25 @@ See: https://adventofcode.com/2021/day/15
 """
 
 from __future__ import annotations
-from skimage import graph
 import numpy as np
-from pathlib import Path
-import logging
-logging.basicConfig(level=logging.DEBUG)
+import AoC
 
 
 IMPORT_FILE = '15.input'
 
 
-def import_risk_lvl(filename: str) -> np.array:
-    """Import file from filename into a numpy array
+def parse_risk_lvl(data: str) -> np.array:
+    """Parse the puzzle input into a numpy array
 
-    The file is assumed to contain values from 0-9 without separators.
+    The input is assumed to contain values from 0-9 without separators.
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
-        np.array: Numpy array with the data from the file
+        np.array: Numpy uint8 array with the puzzle input
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
-        return np.array([[int(c) for c in list(s.strip())] for s in f])
+    return AoC.digit_grid(data)
 
 
 def expand_riskmap(riskmap: np.array, copies: int = 1) -> np.array:
@@ -46,6 +38,8 @@ def expand_riskmap(riskmap: np.array, copies: int = 1) -> np.array:
 
 
 def minimize_risk(risk_lvls: np.array) -> int:
+    from skimage import graph  # slow to import, so only when needed
+
     cost = graph.MCP(risk_lvls, fully_connected=False)
     rows, cols = risk_lvls.shape
     endpt = (rows - 1, cols - 1)
@@ -53,19 +47,38 @@ def minimize_risk(risk_lvls: np.array) -> int:
     return int(cum_costs[-1, -1] - risk_lvls[0, 0])
 
 
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        risk_lvls = parse_risk_lvl(data)
+
+    with AoC.phase('part 1'):
+        end_risk1 = minimize_risk(risk_lvls)
+
+    with AoC.phase('part 2'):
+        risk_lvls = expand_riskmap(risk_lvls, 4)
+        end_risk2 = minimize_risk(risk_lvls)
+
+    return int(end_risk1), int(end_risk2)
+
+
 def main():
-    risk_lvls = import_risk_lvl(IMPORT_FILE)
-    end_risk = minimize_risk(risk_lvls)
+    end_risk1, end_risk2 = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
-    print(f'Minimized risk: {end_risk}')
-
-    risk_lvls = expand_riskmap(risk_lvls, 4)
-    end_risk = minimize_risk(risk_lvls)
+    print(f'Minimized risk: {end_risk1}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Minimized risk: {end_risk}')
+    print(f'Minimized risk: {end_risk2}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
@@ -5,9 +5,7 @@ See: https://adventofcode.com/2021/day/16
 """
 
 from __future__ import annotations
-import bitstring
-import logging
-logging.basicConfig(level=logging.INFO)
+import AoC
 
 
 IMPORT_FILE = '16.input'
@@ -63,12 +61,12 @@ class BITS_packet:
         self.version = self.bitarray[VERSION_BITS].uint
         self.packetid = self.bitarray[PACKET_ID_BITS].uint
 
-        logging.debug(f'Parsed: {self.version=} and {self.packetid=}')
+        AoC.trace(lambda: f'Parsed: {self.version=} and {self.packetid=}')
 
         # Process literal
         if self.packetid == PACKET_TYPE_LITERAL:
             self._process_literal()
-            logging.debug(f'Parsed literal: {self.literal_value}')
+            AoC.trace(lambda: f'Parsed literal: {self.literal_value}')
             return
 
         # Process operator
@@ -77,17 +75,18 @@ class BITS_packet:
         self.length_value = self.bitarray[len_idx].uint
         self.nested_packets = []
 
-        logging.debug(f'Parsed operator: {self.length_type_id=} '
-                      f'{self.length_value=}')
+        AoC.trace(lambda: f'Parsed operator: {self.length_type_id=} '
+                          f'{self.length_value=}')
 
         # process length_type_id 1, number of sub packets is known
         if self.length_type_id:
             self.remainder = self.bitarray[LENGTH_ID_1_IDX:]
             for i in range(self.length_value):
-                logging.debug(f'*** Getting package {i} for {str(self)}')
+                AoC.trace(lambda: f'*** Getting package {i} for {str(self)}')
                 package = BITS_packet.from_string(self.remainder.bin, 'bin')
 
-                logging.debug(f'Parsed {self.remainder=} into {str(package)}')
+                AoC.trace(lambda: f'Parsed {self.remainder=} '
+                                  f'into {str(package)}')
 
                 self.nested_packets.append(package)
                 self.remainder = package.remainder
@@ -99,7 +98,7 @@ class BITS_packet:
         while initial_bits - len(self.remainder) < self.length_value:
             package = BITS_packet.from_string(self.remainder.bin, 'bin')
 
-            logging.debug(f'Parsed {self.remainder=} into {str(package)}')
+            AoC.trace(lambda: f'Parsed {self.remainder=} into {str(package)}')
 
             self.nested_packets.append(package)
             self.remainder = package.remainder
@@ -161,10 +160,12 @@ class BITS_packet:
 
     @classmethod
     def from_string(cls, string: str, type='hex') -> BITS_packet:
+        import bitstring  # slow to import, so only when needed
+
         result = cls()
         result.bitarray = bitstring.BitArray(**{type: str(string)})
 
-        logging.debug(f'Parsed {type} {string} to {result.bitarray.bin}')
+        AoC.trace(lambda: f'Parsed {type} {string} to {result.bitarray.bin}')
 
         result._get_data_from_bitarray()
         return result
@@ -176,15 +177,37 @@ class BITS_packet:
             return BITS_packet.from_string(line)
 
 
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        BITSmsg = BITS_packet.from_string(AoC.as_text(data).strip())
+
+    with AoC.phase('part 1'):
+        version_sum = BITSmsg.version_sum()
+
+    with AoC.phase('part 2'):
+        value = BITSmsg.calculate()
+
+    return version_sum, value
+
+
 def main():
-    BITSmsg = BITS_packet.from_file(IMPORT_FILE)
+    version_sum, value = solve(AoC.read_input(IMPORT_FILE))
 
     print('*** First part of the assignment ***')
-    print(f'Sum of versions: {BITSmsg.version_sum()}')
+    print(f'Sum of versions: {version_sum}')
 
     print('\n*** Second part of the assignment ***')
-    print(f'Minimized risk: {BITSmsg.calculate()}')
+    print(f'Minimized risk: {value}')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
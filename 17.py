@@ -5,29 +5,24 @@ See: https://adventofcode.com/2021/day/17
 """
 
 from __future__ import annotations
-import logging
+import io
+import AoC
 import itertools
-from pathlib import Path
-logging.basicConfig(level=logging.INFO)
 
 
 IMPORT_FILE = '17.input'
 
 
-def import_target_zone(filename: str) -> list:
-    """Import file from filename into a list with min/max x/y pairs
+def parse_target_zone(data: str) -> list:
+    """Parse the puzzle input into a list with min/max x/y pairs
 
     Args:
-        filename (str): name of the file to be read
+        data (str): puzzle input (str or bytes)
 
     Returns:
         list[tuple]: [(min_x, max_x), (min_y, max_y)]
     """
-    # Get the path of this Python file
-    path = Path(__file__).with_name(filename)
-
-    # Open file in the same path as this Python file
-    with path.open('rt') as f:
+    with io.StringIO(AoC.as_text(data)) as f:
         s = f.readline().strip()
         x = tuple(int(v) for v in s.split('x=')[1].split(',')[0].split('..'))
         y = tuple(int(v) for v in s.split('y=')[1].split(',')[0].split('..'))
@@ -50,7 +45,7 @@ def find_xy(min_x, max_x, min_y, max_y) -> list:
                 # Store result: begin speed, speed at pos, steps and pos
                 x_solutions.add((begin_vx, vx, begin_vx - vx, pos))
 
-    logging.debug(f'Found all x solutions: {sorted(x_solutions)}')
+    AoC.trace(lambda: f'Found all x solutions: {sorted(x_solutions)}')
 
     y_solutions = set()
     for begin_vy in range(min_y - 1, max(-min_y, max_y) + 1):
@@ -63,7 +58,7 @@ def find_xy(min_x, max_x, min_y, max_y) -> list:
                 # Store result: begin speed, speed at pos, steps and pos
                 y_solutions.add((begin_vy, vy, begin_vy - vy, pos))
 
-    logging.debug(f'Found all y solutions: {sorted(y_solutions)}')
+    AoC.trace(lambda: f'Found all y solutions: {sorted(y_solutions)}')
 
     valid_xy = set()
     for x_solution, y_solution in itertools.product(x_solutions, y_solutions):
@@ -73,33 +68,51 @@ def find_xy(min_x, max_x, min_y, max_y) -> list:
                 (y_solution[2] > x_solution[2] and x_solution[1] == 0)):
             valid_xy.add((x_solution[0], y_solution[0]))
 
-    logging.debug(f'Matching (x, y) solutions: {sorted(valid_xy)}')
+    AoC.trace(lambda: f'Matching (x, y) solutions: {sorted(valid_xy)}')
 
     return sorted(valid_xy)
 
 
-def main():
-    target_zone = import_target_zone(IMPORT_FILE)
-    logging.debug(f'{target_zone=}')
+def solve(data: str) -> tuple:
+    """Solve both parts of the assignment for the puzzle input data
+
+    Args:
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    with AoC.phase('parse'):
+        target_zone = parse_target_zone(data)
+    AoC.trace(lambda: f'{target_zone=}')
 
-    # If start_y = -min_y + 1, it maximizes height; it lands exactly
-    # at the bottom of the target area (coordinate y_min).
-    # It's height = 1/2 * (-min_y+1) * -min_y
-    max_height = target_zone[1][0] * (target_zone[1][0] + 1) // 2
+    with AoC.phase('part 1'):
+        # If start_y = -min_y + 1, it maximizes height; it lands exactly
+        # at the bottom of the target area (coordinate y_min).
+        # It's height = 1/2 * (-min_y+1) * -min_y
+        max_height = target_zone[1][0] * (target_zone[1][0] + 1) // 2
 
     """ This code is now obsolete (but works!):
     start_vy = find_y(*target_zone[1])
     max_height = distance(*start_vy[-1])
     """
 
+    with AoC.phase('part 2'):
+        valid_xy = find_xy(*target_zone[0], *target_zone[1])
+
+    return max_height, len(valid_xy)
+
+
+def main():
+    max_height, num_solutions = solve(AoC.read_input(IMPORT_FILE))
+
     print('*** First part of the assignment ***')
     print(f'Sum of versions: {max_height}')
 
-    valid_xy = find_xy(*target_zone[0], *target_zone[1])
-
     print('\n*** Second part of the assignment ***')
-    print(f'Found {len(valid_xy)} solutions.')
+    print(f'Found {num_solutions} solutions.')
 
 
 if __name__ == "__main__":
+    AoC.setup_logging()
     main()
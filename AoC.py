@@ -0,0 +1,477 @@
+"""
+Shared helpers for the Advent of Code 2021 solutions
+
+numpy is imported by the helpers that need it, so days that don't use numpy
+don't pay for its import.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import contextlib
+import cProfile
+import hashlib
+import importlib.util
+import inspect
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import typing
+import warnings
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+ZERO = ord('0')
+TRACE_ENV_VAR = 'AOC_TRACE'
+CACHE_DIR_ENV_VAR = 'AOC_CACHE_DIR'
+CACHE_DIR = '.aoc_cache'
+CACHE_FORMAT = 2  # version of the layout of cached_parse entries
+CACHE_SIZE = 2**28  # bytes of parsed inputs kept by cached_parse
+
+_parse_cache_enabled = False  # see parse_cache
+
+
+def input_path(filename: str) -> Path:
+    """Returns the path of filename, relative to the directory of this file
+
+    Absolute filenames are returned unchanged.
+
+    Args:
+        filename (str): name of the file
+
+    Returns:
+        Path: path of the file
+    """
+    return Path(__file__).parent / filename
+
+
+def read_input(filename: str) -> bytes:
+    """Returns the content of an input file
+
+    Args:
+        filename (str): name of the file, relative to this file
+
+    Returns:
+        bytes: content of the file
+    """
+    return input_path(filename).read_bytes()
+
+
+def as_text(data: bytes) -> str:
+    """Returns the puzzle input data (bytes or str) as str"""
+    return data if isinstance(data, str) else bytes(data).decode()
+
+
+def as_bytes(data: str) -> bytes:
+    """Returns the puzzle input data (bytes or str) as bytes"""
+    return data.encode() if isinstance(data, str) else bytes(data)
+
+
+def parse_numbers(text: str, sep: str = ' ', dtype=int) -> np.array:
+    """Parses numbers separated by sep in one vectorized step
+
+    numpy.fromstring stops at the first token it can't parse and only
+    issues a DeprecationWarning (hidden outside __main__), so bad input
+    would silently be cut short. This raises instead.
+
+    Args:
+        text (str): numbers separated by sep (str or bytes); whitespace
+                    around the separators is ignored
+        sep (str, optional): separator. Defaults to whitespace.
+        dtype (optional): type of the numbers. Defaults to int.
+
+    Raises:
+        ValueError: if text contains anything but numbers and separators
+
+    Returns:
+        np.array: 1d array of the numbers
+
+    Example:
+    >>> parse_numbers('1 2\\n3\\n')
+    array([1, 2, 3])
+    >>> parse_numbers('1,2,oops,3', sep=',')
+    Traceback (most recent call last):
+    ...
+    ValueError: Expected numbers separated by ',' in '1,2,oops,3'
+    """
+    import numpy as np
+
+    if not text.strip():
+        return np.zeros(0, dtype=dtype)  # fromstring would return [0]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=sep)
+        except DeprecationWarning:
+            snippet = text if len(text) <= 40 else f'{text[:40]}...'
+            raise ValueError(f'Expected numbers separated by {sep!r} in '
+                             f'{snippet!r}') from None
+
+
+def digit_grid(data: bytes) -> np.array:
+    """Converts lines of digits (without separators) into a 2d uint8 array
+
+    The conversion is done in one vectorized step: the newlines are checked
+    to be at equal distances, the digits are viewed as a 2d array (with the
+    line endings as stride) and ASCII '0' is subtracted.
+
+    Args:
+        data (bytes): raw file content (bytes, str or numpy uint8 array)
+
+    Raises:
+        ValueError: if the lines have unequal lengths or contain non-digits
+
+    Returns:
+        np.array: 2d uint8 array with values 0-9
+
+    Example:
+    >>> digit_grid(b'123\\n456\\n')
+    array([[1, 2, 3],
+           [4, 5, 6]], dtype=uint8)
+    >>> digit_grid(b'12\\n456\\n')
+    Traceback (most recent call last):
+    ...
+    ValueError: Ragged lines: expected lines of 2 digits
+    """
+    import numpy as np
+
+    raw = data if isinstance(data, np.ndarray) else \
+        np.frombuffer(as_bytes(data), dtype=np.uint8)
+
+    # Ignore trailing line endings
+    end = len(raw)
+    while end and raw[end - 1] in (NEWLINE, CARRIAGE_RETURN):
+        end -= 1
+    if end == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    # The first newline determines the line length (stride) of all lines
+    newlines = np.flatnonzero(raw[:end] == NEWLINE)
+    stride = newlines[0] + 1 if len(newlines) else end + 1
+    width = stride - 1
+    if width and raw[width - 1] == CARRIAGE_RETURN:
+        width -= 1  # Windows line endings
+    line_end = stride - width
+    rows = (end + line_end) // stride
+
+    if ((end + line_end) % stride or
+            not np.array_equal(newlines, np.arange(stride - 1, end, stride))):
+        raise ValueError(f'Ragged lines: expected lines of {width} digits')
+
+    lines = np.lib.stride_tricks.as_strided(
+        raw, shape=(rows, width), strides=(stride, 1), writeable=False)
+    grid = lines - np.uint8(ZERO)  # wraps non-digits to values > 9
+    if (grid > 9).any():
+        raise ValueError('Grid contains non-digit characters')
+
+    return grid
+
+
+def import_digit_grid(filename: str, memory_map: bool = False) -> np.array:
+    """Import file from filename into a 2d uint8 numpy array
+
+    The file is assumed to contain values from 0-9 without separators.
+
+    Args:
+        filename (str): name of the file to be read
+        memory_map (bool, optional): memory-map the file instead of reading
+                                     it. Defaults to False.
+
+    Returns:
+        np.array: 2d uint8 array with the data from the file
+    """
+    import numpy as np
+
+    path = input_path(filename)
+    if memory_map and path.stat().st_size:
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+    else:
+        raw = np.fromfile(path, dtype=np.uint8)
+
+    return digit_grid(raw)
+
+
+@contextlib.contextmanager
+def parse_cache(enabled: bool = True):
+    """Context manager that switches the disk cache of cached_parse on
+
+    The cache is off by default, so solve(data) of the days doesn't touch
+    the disk. The file based runs (the main() of the days and run_all.py)
+    switch it on.
+
+    Args:
+        enabled (bool, optional): switch the cache on (or off) within the
+                                  with block. Defaults to True.
+    """
+    global _parse_cache_enabled
+    previous, _parse_cache_enabled = _parse_cache_enabled, enabled
+    try:
+        yield
+    finally:
+        _parse_cache_enabled = previous
+
+
+def cached_parse(data: bytes, parser: callable,
+                 max_size: int = CACHE_SIZE):
+    """Returns parser(data), cached in NumPy binary form
+
+    Outside a parse_cache() block, this is just parser(data).
+    The cache is keyed by the content of data, the source code of the
+    module of the parser and of this module, the numpy version and
+    CACHE_FORMAT, so a change to the parser or the helpers and constants
+    it uses invalidates it. Cached arrays are loaded memory-mapped
+    (copy-on-write: changes are not written back). The cache is stored in
+    .aoc_cache next to this file, or in the directory in AOC_CACHE_DIR.
+    When it grows beyond max_size bytes, the least recently used entries
+    are removed.
+
+    Args:
+        data (bytes): puzzle input (bytes or str)
+        parser (callable): function of data that returns a numpy array or a
+                           tuple of numpy arrays (not of dtype object)
+        max_size (int, optional): maximum size of the cache in bytes.
+                                  Defaults to CACHE_SIZE.
+
+    Returns:
+        np.array | tuple: result of parser(data)
+    """
+    if not _parse_cache_enabled:
+        return parser(data)
+
+    import numpy as np
+
+    key = hashlib.sha256(f'{CACHE_FORMAT} {np.__version__}\n'.encode())
+    key.update(inspect.getsource(inspect.getmodule(parser)).encode())
+    key.update(Path(__file__).read_bytes())
+    key.update(as_bytes(data))
+    cache_root = Path(os.environ.get(CACHE_DIR_ENV_VAR,
+                                     input_path(CACHE_DIR)))
+    cache_dir = cache_root / (f'{Path(inspect.getfile(parser)).stem}.'
+                              f'{parser.__name__}.{key.hexdigest()[:32]}')
+
+    if cache_dir.is_dir():
+        trace(lambda: f'Loading parsed input from cache {cache_dir}')
+        with contextlib.suppress(OSError):
+            os.utime(cache_dir)  # mark as recently used
+        arrays = tuple(_load_array(path)
+                       for path in sorted(cache_dir.glob('*.npy')))
+        return arrays[0] if (cache_dir / 'array.npy').exists() else arrays
+
+    result = parser(data)
+    arrays = (result,) if isinstance(result, np.ndarray) else result
+    if any(array.dtype.hasobject for array in arrays):
+        return result  # can't be stored without pickle
+
+    # Write to a temporary directory first, so the cache is never incomplete
+    cache_root.mkdir(parents=True, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_root)
+    names = (['array'] if isinstance(result, np.ndarray) else
+             [f'{n:04}' for n in range(len(arrays))])
+    for name, array in zip(names, arrays):
+        np.save(Path(tmp_dir) / f'{name}.npy', array, allow_pickle=False)
+    try:
+        os.rename(tmp_dir, cache_dir)
+        trace(lambda: f'Stored parsed input in cache {cache_dir}')
+    except OSError:
+        shutil.rmtree(tmp_dir)  # stored by a concurrent run
+    _evict_cache(cache_root, max_size)
+
+    return result
+
+
+def _evict_cache(cache_root: Path, max_size: int) -> None:
+    # Entries are directories; temporary directories (tmp*) are in progress
+    entries = []
+    for entry in cache_root.iterdir():
+        if entry.is_dir() and not entry.name.startswith('tmp'):
+            with contextlib.suppress(OSError):
+                entries.append((entry.stat().st_mtime, entry,
+                                sum(path.stat().st_size
+                                    for path in entry.iterdir())))
+
+    total = sum(size for _, _, size in entries)
+    for _, entry, size in sorted(entries, key=lambda e: e[0]):
+        if total <= max_size:
+            break
+        trace(lambda: f'Removing least recently used cache entry {entry}')
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+
+def _load_array(path: Path) -> np.array:
+    import numpy as np
+
+    try:
+        return np.load(path, mmap_mode='c', allow_pickle=False)
+    except ValueError:
+        # Empty arrays can't be memory-mapped
+        return np.load(path, allow_pickle=False)
+
+
+def setup_logging(level: int = None) -> None:
+    """Configures logging for a day's solution
+
+    Tracing (DEBUG level) is only switched on when the environment variable
+    AOC_TRACE is set, or when level is given explicitly.
+
+    Args:
+        level (int, optional): logging level. Defaults to INFO or DEBUG,
+                               depending on AOC_TRACE.
+    """
+    if level is None:
+        tracing_on = os.environ.get(TRACE_ENV_VAR)
+        level = logging.DEBUG if tracing_on else logging.INFO
+    logging.basicConfig(level=level)
+
+
+def tracing() -> bool:
+    """Returns True if trace (DEBUG level) messages are logged
+
+    Use this to guard trace-only work that is more than building a message.
+
+    Returns:
+        bool: True if tracing is on
+    """
+    return logging.root.isEnabledFor(logging.DEBUG)
+
+
+def trace(message, *args) -> None:
+    """Logs a trace (DEBUG level) message; builds it only when tracing is on
+
+    Args:
+        message (str | callable): message, or a callable returning the
+                                  message, e.g. lambda: f'{expensive()}'
+        args: optional %-style arguments, formatted only when logged
+
+    Example:
+    >>> trace(lambda: 1 / 0)  # never evaluated with tracing off
+    """
+    if logging.root.isEnabledFor(logging.DEBUG):
+        logging.debug(message() if callable(message) else message, *args)
+
+
+def days() -> list:
+    """Returns the day numbers of all solutions (files 01.py, 02.py, ...)
+
+    Returns:
+        list[int]: sorted day numbers
+    """
+    return sorted(int(path.stem) for path in input_path('.').glob('*.py')
+                  if path.stem.isdigit())
+
+
+def load_day(day: int) -> types.ModuleType:
+    """Imports the solution module of a day
+
+    The modules are named after the day (01.py, ...), so they can't be
+    imported with a regular import statement.
+
+    Args:
+        day (int): day number
+
+    Returns:
+        types.ModuleType: the module, registered as 'dayNN' in sys.modules
+    """
+    name = f'day{day:02}'
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name, input_path(f'{day:02}.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+
+    return sys.modules[name]
+
+
+class Profiler:
+    """Collects the timing and peak memory of the phases of a run
+
+    Days mark their phases (parse, part 1, part 2) with AoC.phase(). While
+    a Profiler is active (used as context manager), each phase adds a record
+    to its records: wall time, CPU time and, when memory is True, the peak
+    memory allocated during the phase (measured with tracemalloc). When
+    cprofile_dir is set, cProfile statistics of each phase are dumped to
+    <cprofile_dir>/<label>.<phase>.prof.
+
+    Example:
+    >>> with Profiler('demo') as profiler:
+    ...     with phase('parse'):
+    ...         data = list(range(1000))
+    >>> [record['phase'] for record in profiler.records]
+    ['parse']
+    """
+    active = None
+
+    def __init__(self, label: str = 'run', memory: bool = False,
+                 cprofile_dir: str = None) -> None:
+        self.label = label
+        self.memory = memory
+        self.cprofile_dir = cprofile_dir
+        self.records = []
+
+    def __enter__(self) -> Profiler:
+        if self.memory:
+            tracemalloc.start()
+        Profiler.active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        Profiler.active = None
+        if self.memory:
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Context manager that records the phase name"""
+        if self.memory:
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        if self.cprofile_dir:
+            profile = cProfile.Profile()
+            profile.enable()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        try:
+            yield
+        finally:
+            record = {'phase': name,
+                      'wall': time.perf_counter() - wall_start,
+                      'cpu': time.process_time() - cpu_start}
+            if self.memory:
+                record['peak_memory'] = \
+                    tracemalloc.get_traced_memory()[1] - memory_start
+            if self.cprofile_dir:
+                profile.disable()
+                stats_file = Path(self.cprofile_dir) / \
+                    f'{self.label}.{name.replace(" ", "")}.prof'
+                profile.dump_stats(stats_file)
+                record['cprofile'] = str(stats_file)
+            self.records.append(record)
+
+
+def phase(name: str):
+    """Marks a phase of a run (e.g. 'parse', 'part 1') for profiling
+
+    Does nothing when no Profiler is active.
+
+    Args:
+        name (str): name of the phase
+
+    Returns:
+        context manager for the phase
+    """
+    if Profiler.active is None:
+        return contextlib.nullcontext()
+    return Profiler.active.phase(name)
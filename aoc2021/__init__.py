@@ -0,0 +1,62 @@
+"""
+Importable solutions of Advent of Code 2021
+
+Every day has a pure solve(data) function that takes the puzzle input (str
+or bytes) and returns the answers to both parts, without reading files or
+printing. The day modules are loaded on first use.
+
+Example:
+>>> import aoc2021
+>>> aoc2021.solve(1, '199 200 208 210 200 207 240 269 260 263')
+(7, 5)
+>>> aoc2021.day01.solve(b'199 200 208 210 200 207 240 269 260 263')
+(7, 5)
+"""
+
+from __future__ import annotations
+import types
+import AoC
+
+
+DAYS = AoC.days()
+
+
+def day(number: int) -> types.ModuleType:
+    """Returns the solution module of a day
+
+    Args:
+        number (int): day number
+
+    Raises:
+        ValueError: if there is no solution for the day
+
+    Returns:
+        types.ModuleType: module with solve(data) and parse functions
+    """
+    if number not in DAYS:
+        raise ValueError(f'No solution for day {number}')
+    return AoC.load_day(number)
+
+
+def solve(number: int, data: str) -> tuple:
+    """Solves both parts of a day for the puzzle input data
+
+    Args:
+        number (int): day number
+        data (str): puzzle input (str or bytes)
+
+    Returns:
+        tuple: (answer to part 1, answer to part 2)
+    """
+    return day(number).solve(data)
+
+
+def __getattr__(name: str) -> types.ModuleType:
+    # Makes aoc2021.day01 ... aoc2021.day17 available as attributes
+    if name.startswith('day') and name[3:].isdigit():
+        return day(int(name[3:]))
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + [f'day{n:02}' for n in DAYS])
@@ -0,0 +1,136 @@
+#!python3
+"""
+Solves many puzzle inputs of a day concurrently and streams the answers
+
+The input files are read in threads, solved in a pool of worker processes
+and the results are written as JSON lines in the order they finish. At most
+max_pending inputs are read or solved at a time, so memory stays bounded
+for any number of files.
+
+Usage: python batch.py DAY FILE... [-w WORKERS] [--max-pending N]
+                       [-o OUTPUT]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import json
+import os
+import sys
+import time
+import AoC
+
+
+def _init_worker() -> None:
+    AoC.setup_logging()
+
+
+def _solve(day: int, data: bytes) -> tuple:
+    start = time.perf_counter()
+    answers = list(AoC.load_day(day).solve(data))
+    return answers, time.perf_counter() - start
+
+
+async def solve_files(day: int, filenames: list, workers: int = None,
+                      max_pending: int = None):
+    """Solves the input files of a day; yields the results as they finish
+
+    Args:
+        day (int): day number
+        filenames (iterable[str]): input files
+        workers (int, optional): number of worker processes.
+                                 Defaults to the number of CPUs.
+        max_pending (int, optional): maximum number of inputs that are read
+                                     or solved at a time. Defaults to twice
+                                     the number of workers.
+
+    Yields:
+        dict: file, day and answers and solve time (or an error message)
+    """
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+    loop = asyncio.get_running_loop()
+
+    async def solve_file(filename: str) -> dict:
+        result = {'file': filename, 'day': day}
+        try:
+            data = await asyncio.to_thread(Path(filename).read_bytes)
+            answers, seconds = await loop.run_in_executor(
+                executor, _solve, day, data)
+            result.update(answers=answers, wall=round(seconds, 6))
+        except Exception as exc:
+            result['error'] = f'{type(exc).__name__}: {exc}'
+        return result
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker) as executor:
+        pending = set()
+        for filename in filenames:
+            if len(pending) >= max_pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.create_task(solve_file(str(filename))))
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+
+async def run_batch(day: int, filenames: list, output, workers: int = None,
+                    max_pending: int = None) -> int:
+    """Solves the input files of a day and writes the results as JSON lines
+
+    Args:
+        day (int): day number
+        filenames (iterable[str]): input files
+        output (file): text file to write the JSON lines to
+        workers (int, optional): number of worker processes
+        max_pending (int, optional): maximum number of inputs in progress
+
+    Returns:
+        int: number of inputs that failed
+    """
+    errors = 0
+    async for result in solve_files(day, filenames, workers, max_pending):
+        errors += 'error' in result
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('day', type=int, choices=AoC.days(), metavar='DAY')
+    parser.add_argument('files', metavar='FILE', nargs='+',
+                        help='input files to solve')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: #CPUs)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='maximum number of inputs in progress '
+                             '(default: 2 x workers)')
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help='write the JSON lines to FILE (default: stdout)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with (open(args.output, 'wt') if args.output else
+          contextlib.nullcontext(sys.stdout)) as output:
+        errors = asyncio.run(run_batch(args.day, args.files, output,
+                                       args.workers, args.max_pending))
+    print(f'Solved {len(args.files)} inputs in '
+          f'{time.perf_counter() - start:.3f} s; {errors} failed',
+          file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    AoC.setup_logging()
+    main()
@@ -0,0 +1,7 @@
+"""
+Benchmarks for the Advent of Code 2021 solutions
+
+- generators: seeded, scalable synthetic inputs for every day
+- scaling: timed runs of every day at increasing input sizes, compared
+  against a saved baseline
+"""
@@ -0,0 +1,255 @@
+"""
+Seeded synthetic input generators for every day of Advent of Code 2021
+
+Each generator takes a scale factor and a numpy random generator and returns
+the text of an input file. Scale 1 gives an input of about the size of the
+real puzzle input; the size of the input grows linearly with the scale
+(number of lines, or number of cells for 2d inputs).
+"""
+
+from __future__ import annotations
+import math
+import string
+import numpy as np
+
+
+SEED = 2021
+
+SEVEN_SEGMENT_DIGITS = ['abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf',
+                        'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg']
+CHUNK_PAIRS = dict(zip('([{<', ')]}>'))
+POLYMER_ELEMENTS = 'BCFHKNOPSV'
+PACKET_OPERATORS = [0, 1, 2, 3, 5, 6, 7]  # all types, except literal (4)
+
+
+def _lines(rows) -> str:
+    return ''.join(f'{row}\n' for row in rows)
+
+
+def _digit_grid(rows: int, cols: int, low: int, rng) -> str:
+    grid = rng.integers(low, 10, size=(rows, cols))
+    return _lines(''.join(map(str, row)) for row in grid)
+
+
+def _side(base: int, scale: int) -> int:
+    # Side of a square grid with scale times the area of a base x base grid
+    return int(base * math.sqrt(scale))
+
+
+def day01(scale: int, rng) -> str:
+    """Sonar sweep: a random walk of depths"""
+    steps = rng.integers(-10, 20, size=2000 * scale)
+    return _lines(np.abs(np.cumsum(steps)) + 100)
+
+
+def day02(scale: int, rng) -> str:
+    """Dive: forward/down/up commands"""
+    commands = rng.choice(['forward', 'down', 'up'], size=1000 * scale,
+                          p=[0.4, 0.35, 0.25])
+    return _lines(f'{command} {magnitude}' for command, magnitude in
+                  zip(commands, rng.integers(1, 10, size=len(commands))))
+
+
+def day03(scale: int, rng) -> str:
+    """Binary diagnostic: all numbers of a bit width, shuffled
+
+    A complete set keeps the bit criteria of part 2 well defined (there is
+    always a tie), so the width grows with log2 of the scale.
+    """
+    width = 10 + round(math.log2(scale))
+    return _lines(f'{value:0{width}b}' for value in rng.permutation(2**width))
+
+
+def day04(scale: int, rng) -> str:
+    """Giant squid: draws of 0-99 and 5x5 bingo boards"""
+    draws = ','.join(map(str, rng.permutation(100)))
+    boards = (rng.permutation(100)[:25].reshape(5, 5)
+              for _ in range(100 * scale))
+    return draws + '\n' + ''.join(
+        '\n' + _lines(' '.join(f'{n:2}' for n in row) for row in board)
+        for board in boards)
+
+
+def day05(scale: int, rng) -> str:
+    """Hydrothermal venture: horizontal, vertical and diagonal segments"""
+    count = 500 * scale
+    start = rng.integers(0, 1000, size=(count, 2))
+    direction = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1)], size=count)
+    direction *= rng.choice([-1, 1], size=(count, 1))
+
+    # Limit the length, so the segment stays within 0-999 on both axes
+    room = np.where(direction > 0, 999 - start,
+                    np.where(direction < 0, start, 999)).min(axis=1)
+    length = rng.integers(1, 300, size=count) % (room + 1)
+    end = start + direction * length[:, None]
+
+    return _lines(f'{x1},{y1} -> {x2},{y2}'
+                  for (x1, y1), (x2, y2) in zip(start, end))
+
+
+def day06(scale: int, rng) -> str:
+    """Lanternfish: initial timers"""
+    return ','.join(map(str, rng.integers(1, 6, size=300 * scale))) + '\n'
+
+
+def day07(scale: int, rng) -> str:
+    """Treachery of whales: crab positions"""
+    positions = rng.integers(0, 2000, size=1000 * scale)
+    return ','.join(map(str, positions)) + '\n'
+
+
+def day08(scale: int, rng) -> str:
+    """Seven segment search: scrambled patterns and four output digits"""
+    def scramble(wiring: dict, digit: int) -> str:
+        return ''.join(rng.permutation(
+            [wiring[segment] for segment in SEVEN_SEGMENT_DIGITS[digit]]))
+
+    entries = []
+    for _ in range(200 * scale):
+        wiring = dict(zip('abcdefg', rng.permutation(list('abcdefg'))))
+        patterns = [scramble(wiring, digit) for digit in rng.permutation(10)]
+        output = [scramble(wiring, digit) for digit in rng.integers(0, 10, 4)]
+        entries.append(' '.join(patterns) + ' | ' + ' '.join(output))
+    return _lines(entries)
+
+
+def day09(scale: int, rng) -> str:
+    """Smoke basin: square height map"""
+    side = _side(100, scale)
+    return _digit_grid(side, side, 0, rng)
+
+
+def day10(scale: int, rng) -> str:
+    """Syntax scoring: incomplete and corrupted lines of chunks"""
+    lines = []
+    for _ in range(100 * scale):
+        line, stack = [], []
+        corrupt = rng.random() < 0.5
+        for _ in range(rng.integers(20, 110)):
+            if len(stack) > 1 and rng.random() < 0.4:
+                line.append(stack.pop())
+            else:
+                opening = rng.choice(list(CHUNK_PAIRS))
+                line.append(opening)
+                stack.append(CHUNK_PAIRS[opening])
+        if corrupt:
+            wrong = [c for c in CHUNK_PAIRS.values() if c != stack[-1]]
+            line.append(rng.choice(wrong))
+        lines.append(''.join(line))
+    return _lines(lines)
+
+
+def day11(scale: int, rng) -> str:
+    """Dumbo octopus: square energy grid"""
+    side = _side(10, scale)
+    return _digit_grid(side, side, 0, rng)
+
+
+def day12(scale: int, rng) -> str:
+    """Passage pathing: cave graph without adjacent big caves"""
+    def names(count: int, letters: str) -> list:
+        return [''.join(rng.choice(list(letters), 2)) + str(n)
+                for n in range(count)]
+
+    small = ['start', 'end'] + names(4 + scale, string.ascii_lowercase)
+    big = names(1 + scale // 2, string.ascii_uppercase)
+    edges = {('start', small[2]), (small[3], 'end')}
+    while len(edges) < 12 * scale:
+        node1 = rng.choice(small + big)
+        node2 = rng.choice(small)
+        if node1 != node2 and (node2, node1) not in edges:
+            edges.add((node1, node2))
+    return _lines(f'{node1}-{node2}' for node1, node2 in edges)
+
+
+def day13(scale: int, rng) -> str:
+    """Transparent origami: dots and folds that halve the sheet each time"""
+    shape = [40, 6]
+    folds = []
+    while shape[0] * shape[1] < 1311 * 895 * scale:
+        axis = 0 if shape[0] < 4 * shape[1] else 1
+        folds.append(('xy'[axis], shape[axis]))
+        shape[axis] = 2 * shape[axis] + 1
+
+    dots = {tuple(dot) for dot in
+            rng.integers(0, shape, size=(800 * scale, 2))}
+
+    return (_lines(f'{x},{y}' for x, y in dots) + '\n' +
+            _lines(f'fold along {axis}={value}'
+                   for axis, value in folds[::-1]))
+
+
+def day14(scale: int, rng) -> str:
+    """Extended polymerization: template and all pair insertion rules"""
+    template = ''.join(rng.choice(list(POLYMER_ELEMENTS), 20 * scale))
+    rules = (f'{a}{b} -> {rng.choice(list(POLYMER_ELEMENTS))}'
+             for a in POLYMER_ELEMENTS for b in POLYMER_ELEMENTS)
+    return template + '\n\n' + _lines(rules)
+
+
+def day15(scale: int, rng) -> str:
+    """Chiton: square risk level map"""
+    side = _side(100, scale)
+    return _digit_grid(side, side, 1, rng)
+
+
+def _bits_packet(budget: int, depth: int, rng) -> str:
+    """Returns a random BITS packet with about budget packets, as bit string"""
+    version = f'{rng.integers(0, 8):03b}'
+
+    if budget <= 1 or depth == 0:
+        value = f'{rng.integers(1, 2**12):012b}'
+        groups = [value[i:i + 4] for i in range(0, len(value), 4)]
+        return (version + '100' +
+                ''.join('1' + group for group in groups[:-1]) +
+                '0' + groups[-1])
+
+    packet_type = rng.choice(PACKET_OPERATORS)
+    if packet_type >= 5:  # comparison operators have exactly 2 sub packets
+        count = 2
+    else:
+        count = int(rng.integers(1, min(budget, 2047) + 1))
+    sub_budget = max(1, (budget - 1) // count)
+    payload = ''.join(_bits_packet(sub_budget, depth - 1, rng)
+                      for _ in range(count))
+
+    if len(payload) < 2**15 and rng.random() < 0.5:
+        length = '0' + f'{len(payload):015b}'
+    else:
+        length = '1' + f'{count:011b}'
+    return version + f'{packet_type:03b}' + length + payload
+
+
+def day16(scale: int, rng) -> str:
+    """Packet decoder: hexadecimal transmission of a nested BITS packet"""
+    bits = _bits_packet(60 * scale, 8, rng)
+    bits += '0' * (-len(bits) % 4)
+    return f'{int(bits, 2):0{len(bits) // 4}X}\n'
+
+
+def day17(scale: int, rng) -> str:
+    """Trick shot: target area below and to the right of the probe"""
+    min_x = int(rng.integers(140, 160) * scale)
+    min_y = -int(rng.integers(110, 130) * scale)
+    return (f'target area: x={min_x}..{min_x + 30 * scale}, '
+            f'y={min_y}..{min_y + 50 * scale}\n')
+
+
+GENERATORS = {int(name[3:]): generator
+              for name, generator in list(globals().items())
+              if name.startswith('day') and callable(generator)}
+
+
+def generate(day: int, scale: int = 1, seed: int = SEED) -> str:
+    """Generates a synthetic input for day
+
+    Args:
+        day (int): day number
+        scale (int, optional): input size relative to the puzzle input.
+                               Defaults to 1.
+        seed (int, optional): random seed. Defaults to SEED.
+
+    Returns:
+        str: content of the input file
+    """
+    return GENERATORS[day](scale, np.random.default_rng([seed, day, scale]))
@@ -0,0 +1,94 @@
+"""
+Import-time benchmark: checks the cold start of every day against a budget
+
+Each day is loaded in a fresh interpreter with python -X importtime. The
+import time of a day is the total of its top-level imports, minus the
+imports of an interpreter that imports nothing. Fails (exit code 1) when a
+day goes over the budget.
+
+Usage: python -m benchmarks.importtime [DAY ...] [--budget SECONDS]
+"""
+
+from __future__ import annotations
+import argparse
+import re
+import subprocess
+import sys
+import AoC
+
+
+BUDGET = 0.2
+REPEAT = 3
+IMPORTTIME_LINE = re.compile(
+    r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def import_times(code: str) -> dict:
+    """Runs code in a fresh interpreter and returns its top-level imports
+
+    Args:
+        code (str): Python code to run
+
+    Returns:
+        dict: {module name: cumulative import time in seconds}
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                             cwd=AoC.input_path('.'), capture_output=True,
+                             text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and not match[3]:  # no indent: top-level import
+            times[match[4]] = int(match[2]) / 1e6
+    return times
+
+
+def time_day(day: int, repeat: int = REPEAT) -> tuple:
+    """Measures the import time of a day in a fresh interpreter
+
+    Args:
+        day (int): day number
+        repeat (int, optional): number of runs; the fastest counts
+
+    Returns:
+        tuple: (import time in seconds, name of the slowest import)
+    """
+    best, slowest = None, None
+    for _ in range(repeat):
+        baseline = sum(import_times('pass').values())
+        times = import_times(f'import AoC; AoC.load_day({day})')
+        total = sum(times.values()) - baseline
+        if best is None or total < best:
+            best, slowest = total, max(times, key=times.get)
+    return max(best, 0.0), slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('days', metavar='DAY', type=int, nargs='*',
+                        default=AoC.days(),
+                        help='days to check (default: all)')
+    parser.add_argument('--budget', type=float, default=BUDGET,
+                        help=f'seconds per day (default: {BUDGET})')
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help='runs per day; the fastest counts '
+                             f'(default: {REPEAT})')
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f'{"Day":>3} {"Import (s)":>10}  Slowest import')
+    for day in args.days:
+        seconds, slowest = time_day(day, args.repeat)
+        print(f'{day:>3} {seconds:>10.4f}  {slowest}')
+        if seconds > args.budget:
+            over_budget.append(f'Day {day}: {seconds:.4f} s '
+                               f'(budget: {args.budget} s)')
+
+    print('\n' + '\n'.join(over_budget or ['All days within budget']))
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    AoC.setup_logging()
+    main()
@@ -0,0 +1,200 @@
+"""
+Scaling benchmark: times solve() of every day on synthetic inputs
+
+Each day runs at 1x, 10x and 100x the size of the puzzle input (see
+generators.py), in a separate process with a timeout. The timings can be
+saved as a baseline and later runs are compared against it.
+
+Usage: python -m benchmarks.scaling [DAY ...] [--scales 1 10 100] [--save]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import AoC
+from benchmarks import generators
+
+
+SCALES = (1, 10, 100)
+TIMEOUT = 60
+THRESHOLD = 1.5
+MIN_DELTA = 0.02
+BASELINE_FILE = AoC.input_path('benchmarks/baseline.json')
+
+
+def _timed_solve(day: int, scale: int, seed: int,
+                 queue: multiprocessing.Queue) -> None:
+    """Solves day for a synthetic input and puts the run time on queue"""
+    try:
+        module = AoC.load_day(day)
+        data = generators.generate(day, scale, seed)
+        start = time.perf_counter()
+        module.solve(data)
+        queue.put(time.perf_counter() - start)
+    except Exception as exc:
+        queue.put(f'error: {type(exc).__name__}: {exc}')
+
+
+def time_day(day: int, scale: int, timeout: float = TIMEOUT,
+             seed: int = generators.SEED) -> float | str:
+    """Times solve() of day for a synthetic input of the given scale
+
+    The input is generated in the child process and is not part of the
+    timing.
+
+    Args:
+        day (int): day number
+        scale (int): input size relative to the puzzle input
+        timeout (float, optional): maximum run time in seconds
+        seed (int, optional): random seed for the input generator
+
+    Returns:
+        float | str: run time in seconds; 'timeout' or 'error: ...'
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_timed_solve,
+                                      args=(day, scale, seed, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.kill()
+        process.join()
+        return 'timeout'
+
+    return queue.get() if not queue.empty() else 'error: crashed'
+
+
+def run(days: list, scales: list = SCALES, repeat: int = 1,
+        timeout: float = TIMEOUT, seed: int = generators.SEED) -> dict:
+    """Times all days at all scales
+
+    A day is not run at larger scales after a timeout.
+
+    Args:
+        days (list[int]): day numbers
+        scales (list[int], optional): scales. Defaults to SCALES.
+        repeat (int, optional): number of runs; the fastest counts.
+        timeout (float, optional): maximum run time in seconds per run
+        seed (int, optional): random seed for the input generators
+
+    Returns:
+        dict: {day: {scale: run time in seconds, 'timeout' or 'error'}},
+              with days and scales as strings (JSON keys)
+    """
+    results = {}
+    for day in days:
+        results[f'{day:02}'] = timings = {}
+        for scale in scales:
+            runs = [time_day(day, scale, timeout, seed)
+                    for _ in range(repeat)]
+            numeric = [t for t in runs if isinstance(t, float)]
+            timing = round(min(numeric), 4) if numeric else runs[0]
+            timings[str(scale)] = timing
+
+            print(f'Day {day:2} at {scale:>3}x: {timing}', file=sys.stderr)
+            if timing == 'timeout':
+                break
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = THRESHOLD,
+            min_delta: float = MIN_DELTA) -> list:
+    """Compares results with a baseline
+
+    A run is a regression if it is more than threshold times slower than the
+    baseline and at least min_delta seconds slower (to ignore noise on very
+    short runs), or if it no longer finishes.
+
+    Args:
+        results (dict): results of run()
+        baseline (dict): results of an earlier run()
+        threshold (float, optional): allowed slowdown factor
+        min_delta (float, optional): allowed slowdown in seconds
+
+    Returns:
+        list[str]: description of each regression
+    """
+    regressions = []
+    for day, timings in results.items():
+        for scale, current in timings.items():
+            previous = baseline.get(day, {}).get(scale)
+            if not isinstance(previous, float):
+                continue
+            if not isinstance(current, float):
+                regressions.append(f'Day {day} at {scale}x: {current} '
+                                   f'(baseline: {previous:.4f} s)')
+            elif (current > previous * threshold and
+                    current - previous > min_delta):
+                regressions.append(f'Day {day} at {scale}x: {current:.4f} s '
+                                   f'is {current / previous:.1f}x slower than '
+                                   f'baseline ({previous:.4f} s)')
+    return regressions
+
+
+def format_table(results: dict, scales: list) -> str:
+    """Formats results of run() as a table with one column per scale"""
+    lines = ['Day ' + ''.join(f'{f"{scale}x (s)":>12}' for scale in scales)]
+    for day, timings in results.items():
+        cells = (timings.get(str(scale), '-') for scale in scales)
+        lines.append(f'{day:>3} ' + ''.join(
+            f'{cell:>12.4f}' if isinstance(cell, float) else f'{cell:>12.12}'
+            for cell in cells))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('days', metavar='DAY', type=int, nargs='*',
+                        default=sorted(generators.GENERATORS),
+                        help='days to benchmark (default: all)')
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES,
+                        help=f'input scales (default: {SCALES})')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per day and scale; the fastest counts')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT,
+                        help=f'seconds per run (default: {TIMEOUT})')
+    parser.add_argument('--seed', type=int, default=generators.SEED)
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help='baseline file (default: benchmarks/'
+                             'baseline.json)')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='allowed slowdown factor against the baseline '
+                             f'(default: {THRESHOLD})')
+    parser.add_argument('--min-delta', type=float, default=MIN_DELTA,
+                        help='allowed slowdown in seconds against the '
+                             f'baseline (default: {MIN_DELTA})')
+    args = parser.parse_args()
+
+    results = run(args.days, args.scales, args.repeat, args.timeout,
+                  args.seed)
+    print(format_table(results, args.scales))
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'rt') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'wt') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f'\nSaved baseline to {args.baseline}')
+
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'rt') as f:
+            regressions = compare(results, json.load(f),
+                                  args.threshold, args.min_delta)
+        print('\n' + '\n'.join(regressions or ['No regressions']))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    AoC.setup_logging()
+    main()
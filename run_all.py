@@ -0,0 +1,153 @@
+#!python3
+"""
+Runs all days of Advent of Code 2021 in a process pool
+
+Prints a table with the wall time, CPU time (and optionally peak memory) of
+each phase of each day (parse, part 1, part 2), and the answers.
+Each day runs in its own worker process, so the total run time is about the
+run time of the slowest day (given enough workers).
+
+Usage: python run_all.py [-w WORKERS] [--memory] [--cprofile DIR]
+                         [--json FILE] [DAY ...]
+"""
+
+from __future__ import annotations
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import time
+import AoC
+
+
+def run_day(day: int, memory: bool = False, cprofile_dir: str = None) -> dict:
+    """Solves a day for its puzzle input and returns its answers and profile
+
+    Args:
+        day (int): day number
+        memory (bool, optional): measure peak memory per phase
+        cprofile_dir (str, optional): directory to dump cProfile stats to
+
+    Returns:
+        dict: day, answers, wall and CPU time, phases (see AoC.Profiler) and
+              an error message if solving raised an exception
+    """
+    result = {'day': day, 'answers': []}
+    with AoC.Profiler(f'{day:02}', memory, cprofile_dir) as profiler:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            module = AoC.load_day(day)
+            with AoC.parse_cache():
+                result['answers'] = list(
+                    module.solve(AoC.read_input(module.IMPORT_FILE)))
+        except Exception as exc:
+            result['error'] = f'{type(exc).__name__}: {exc}'
+        result['wall'] = round(time.perf_counter() - wall, 6)
+        result['cpu'] = round(time.process_time() - cpu, 6)
+
+    result['phases'] = [{key: round(value, 6) if key in ('wall', 'cpu')
+                         else value for key, value in record.items()}
+                        for record in profiler.records]
+    return result
+
+
+def run_all(days: list, workers: int = None, memory: bool = False,
+            cprofile_dir: str = None) -> list:
+    """Runs days in a pool of worker processes
+
+    Args:
+        days (list[int]): day numbers
+        workers (int, optional): number of worker processes.
+                                 Defaults to the number of CPUs.
+        memory (bool, optional): measure peak memory per phase
+        cprofile_dir (str, optional): directory to dump cProfile stats to
+
+    Returns:
+        list[dict]: results of run_day for all days, sorted by day
+    """
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker) as executor:
+        # Later days tend to be slower, so submit them first
+        futures = [executor.submit(run_day, day, memory, cprofile_dir)
+                   for day in sorted(days, reverse=True)]
+        for future in concurrent.futures.as_completed(futures):
+            results.append(future.result())
+
+    return sorted(results, key=lambda r: r['day'])
+
+
+def _init_worker() -> None:
+    AoC.setup_logging()
+
+
+def format_table(results: list) -> str:
+    """Formats results of run_all as a text table
+
+    Args:
+        results (list[dict]): results of run_all
+
+    Returns:
+        str: table with one line per day and phase
+    """
+    memory = any('peak_memory' in phase
+                 for r in results for phase in r['phases'])
+    lines = [f'{"Day":>3} {"Phase":<12} {"Wall (s)":>9} {"CPU (s)":>9} ' +
+             (f'{"Peak (MB)":>9} ' if memory else '') + ' Answer']
+    for r in results:
+        for phase in r['phases']:
+            parts = [int(n) for n in re.findall(r'\d', phase['phase'])]
+            answer = ' / '.join(str(r['answers'][part - 1]) for part in parts
+                                if part <= len(r['answers']))
+            if '\n' in answer:
+                indent = 39 + 10 * memory
+                answer = '\n' + '\n'.join(' ' * indent + line
+                                          for line in answer.splitlines())
+            peak = (f'{phase["peak_memory"] / 2**20:>9.1f} '
+                    if 'peak_memory' in phase else '')
+            lines.append(f'{r["day"]:>3} {phase["phase"]:<12} '
+                         f'{phase["wall"]:>9.3f} {phase["cpu"]:>9.3f} '
+                         f'{peak} {answer}')
+        if 'error' in r:
+            lines.append(f'{r["day"]:>3} {"error":<12} {r["error"]}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('days', metavar='DAY', type=int, nargs='*',
+                        default=AoC.days(), help='days to run (default: all)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: #CPUs)')
+    parser.add_argument('--memory', action='store_true',
+                        help='measure peak memory per phase (slower)')
+    parser.add_argument('--cprofile', metavar='DIR',
+                        help='dump cProfile stats per day and phase to DIR')
+    parser.add_argument('--json', metavar='FILE',
+                        help="write the results as JSON to FILE ('-': stdout)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.cprofile:
+        os.makedirs(args.cprofile, exist_ok=True)
+        args.cprofile = os.path.abspath(args.cprofile)
+    results = run_all(args.days, args.workers, args.memory, args.cprofile)
+    total = time.perf_counter() - start
+
+    if args.json == '-':
+        print(json.dumps(results, indent=2))
+        return
+
+    print(format_table(results))
+    print(f'\nTotal wall time: {total:.3f} s; '
+          f'sum of day wall times: {sum(r["wall"] for r in results):.3f} s')
+    if args.json:
+        with open(args.json, 'wt') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    AoC.setup_logging()
+    main()
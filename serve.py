@@ -0,0 +1,279 @@
+#!python3
+"""
+Resident solve server for Advent of Code 2021 on localhost HTTP
+
+Keeps a pool of worker processes with numpy, skimage.graph, bitstring and
+all day modules imported, so a request doesn't pay for interpreter start-up
+and imports. POST the puzzle input to /solve/<day>; the answers are returned
+as JSON. Results are kept in an LRU cache keyed by the hash of the day and
+input, bounded by the total size of the cached answers.
+
+Usage: python serve.py [--host HOST] [--port PORT] [-w WORKERS]
+                       [--cache-size BYTES]
+Client: curl --data-binary @01.input http://localhost:2021/solve/1
+"""
+
+from __future__ import annotations
+from http import HTTPStatus
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import http.server
+import importlib
+import json
+import logging
+import os
+import threading
+import urllib.error
+import urllib.request
+import AoC
+
+
+HOST = '127.0.0.1'
+PORT = 2021
+CACHE_SIZE = 2**26  # bytes of JSON encoded answers
+WARM_MODULES = ('numpy', 'skimage.graph', 'bitstring')
+
+
+class ResultCache:
+    """Thread-safe LRU cache of answers, bounded by their size in bytes
+
+    The size of an entry is the length of its JSON encoded answers. The
+    least recently used entries are evicted until the total size fits
+    max_size; an entry that is larger than max_size is not stored.
+
+    Example:
+    >>> cache = ResultCache(max_size=14)
+    >>> cache.put('a', [1234])
+    >>> cache.put('b', [5678])
+    >>> cache.get('a')
+    [1234]
+    >>> cache.put('c', [9])
+    >>> cache.get('b') is None
+    True
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list:
+        """Returns the cached answers for key, or None"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: str, answers: list) -> None:
+        """Stores answers for key, evicting least recently used entries"""
+        size = len(json.dumps(answers))
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (answers, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def stats(self) -> dict:
+        """Returns the number of entries, their size, hits and misses"""
+        with self._lock:
+            return {'entries': len(self._entries), 'size': self.size,
+                    'max_size': self.max_size, 'hits': self.hits,
+                    'misses': self.misses}
+
+
+def cache_key(day: int, data: bytes) -> str:
+    """Returns the cache key of the input data of a day"""
+    return hashlib.sha256(f'{day:02}\n'.encode() + data).hexdigest()
+
+
+def _init_worker() -> None:
+    AoC.setup_logging()
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+    for day in AoC.days():
+        AoC.load_day(day)
+
+
+def _solve(day: int, data: bytes) -> list:
+    return list(AoC.load_day(day).solve(data))
+
+
+class SolveServer(http.server.ThreadingHTTPServer):
+    """HTTP server that solves days in a pool of warm worker processes
+
+    Each request is handled in its own thread, which waits for a worker
+    process, so requests are solved concurrently (up to the number of
+    workers).
+
+    Args:
+        address (tuple): (host, port) to listen on
+        workers (int, optional): number of worker processes.
+                                 Defaults to the number of CPUs.
+        cache_size (int, optional): maximum size of the result cache in
+                                    bytes. Defaults to CACHE_SIZE.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple, workers: int = None,
+                 cache_size: int = CACHE_SIZE) -> None:
+        super().__init__(address, SolveHandler)
+        self.days = AoC.days()
+        self.workers = workers or os.cpu_count()
+        self.cache = ResultCache(cache_size)
+        self.executor = self._start_pool()
+        self._pool_lock = threading.Lock()
+
+    def _start_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker)
+
+    def _replace_pool(
+            self, broken: concurrent.futures.ProcessPoolExecutor) -> None:
+        # Concurrent requests on the broken pool replace it only once
+        with self._pool_lock:
+            if self.executor is broken:
+                logging.warning('A worker process died; restarting the pool')
+                self.executor = self._start_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self) -> None:
+        """Starts all worker processes and waits until they are ready"""
+        futures = [self.executor.submit(AoC.days)
+                   for _ in range(self.workers)]
+        concurrent.futures.wait(futures)
+
+    def solve(self, day: int, data: bytes) -> tuple:
+        """Returns (answers, cached) for the input data of a day
+
+        When a worker process dies (e.g. out of memory), the pool is
+        replaced and the request is retried once; if the pool breaks again,
+        BrokenProcessPool is raised for this request only.
+        """
+        key = cache_key(day, data)
+        answers = self.cache.get(key)
+        if answers is not None:
+            return answers, True
+
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                answers = executor.submit(_solve, day, data).result()
+                break
+            except concurrent.futures.process.BrokenProcessPool:
+                self._replace_pool(executor)
+                if attempt:
+                    raise
+        self.cache.put(key, answers)
+        return answers, False
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+
+class SolveHandler(http.server.BaseHTTPRequestHandler):
+    """Handles POST /solve/<day> and GET /stats"""
+    server: SolveServer
+
+    def do_POST(self) -> None:
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] != 'solve' or not parts[1].isdigit():
+            self._reply(HTTPStatus.NOT_FOUND, {'error': 'Use /solve/<day>'})
+            return
+
+        day = int(parts[1])
+        if day not in self.server.days:
+            self._reply(HTTPStatus.NOT_FOUND,
+                        {'error': f'No solution for day {day}'})
+            return
+
+        data = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        try:
+            answers, cached = self.server.solve(day, data)
+        except Exception as exc:
+            self._reply(HTTPStatus.UNPROCESSABLE_ENTITY,
+                        {'day': day, 'error': f'{type(exc).__name__}: {exc}'})
+            return
+
+        self._reply(HTTPStatus.OK,
+                    {'day': day, 'answers': answers, 'cached': cached})
+
+    def do_GET(self) -> None:
+        if self.path.strip('/') != 'stats':
+            self._reply(HTTPStatus.NOT_FOUND, {'error': 'Use /stats'})
+            return
+        self._reply(HTTPStatus.OK, {'days': self.server.days,
+                                    'cache': self.server.cache.stats()})
+
+    def _reply(self, status: HTTPStatus, content: dict) -> None:
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        AoC.trace(lambda: f'{self.address_string()} {format % args}')
+
+
+def request(day: int, data: bytes,
+            url: str = f'http://{HOST}:{PORT}') -> dict:
+    """Solves the input data of a day on a running server
+
+    Args:
+        day (int): day number
+        data (bytes): puzzle input (bytes or str)
+        url (str, optional): URL of the server
+
+    Returns:
+        dict: day, answers and cached, or an error message
+    """
+    req = urllib.request.Request(f'{url}/solve/{day}', AoC.as_bytes(data))
+    try:
+        with urllib.request.urlopen(req) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as exc:
+        return json.load(exc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default=HOST,
+                        help=f'address to listen on (default: {HOST})')
+    parser.add_argument('--port', type=int, default=PORT,
+                        help=f'port to listen on (default: {PORT})')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes (default: #CPUs)')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                        help='maximum size of the result cache in bytes '
+                             f'(default: {CACHE_SIZE})')
+    args = parser.parse_args()
+
+    with SolveServer((args.host, args.port), args.workers,
+                     args.cache_size) as server:
+        server.warm_up()
+        logging.info(f'Serving on http://{args.host}:{server.server_port}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    AoC.setup_logging()
+    main()